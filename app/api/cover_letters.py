@@ -1,14 +1,26 @@
 """
 Cover Letter Generation API Endpoints
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
-from app.services.cover_letter_generator import CoverLetterGenerator
+from app.services.cover_letter_generator import CoverLetterGenerator, MODEL_TIERS
+from app.dependencies import get_cover_letter_generator
 
 router = APIRouter()
-generator = CoverLetterGenerator()
+
+MAX_BATCH_SIZE = 20
+
+
+def _validate_model(model: Optional[str]) -> None:
+    """Reject model overrides the generator doesn't route to"""
+    if model and model not in MODEL_TIERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported model (choose from {', '.join(MODEL_TIERS)})"
+        )
 
 
 class CoverLetterRequest(BaseModel):
@@ -16,6 +28,15 @@ class CoverLetterRequest(BaseModel):
     resume_data: dict
     job_data: dict
     tone: Optional[str] = "professional"
+    model: Optional[str] = None  # Defaults to routing by posting size
+
+
+class BatchCoverLetterRequest(BaseModel):
+    """Request model for generating letters for several jobs at once"""
+    resume_data: dict
+    jobs: List[dict]  # Each dict should have: title, company, description
+    tone: Optional[str] = "professional"
+    model: Optional[str] = None  # Defaults to routing each job by posting size
 
 
 class SimpleCoverLetterRequest(BaseModel):
@@ -28,21 +49,28 @@ class SimpleCoverLetterRequest(BaseModel):
 
 
 @router.post("/generate")
-async def generate_cover_letter(request: CoverLetterRequest):
+async def generate_cover_letter(
+    request: CoverLetterRequest,
+    generator: CoverLetterGenerator = Depends(get_cover_letter_generator)
+):
     """
     Generate a cover letter from resume and job data
     
     Args:
         request: Resume data, job data, and tone
+        generator: Shared cover letter generator
         
     Returns:
         Generated cover letter text
     """
+    _validate_model(request.model)
+    
     try:
-        cover_letter = generator.generate_cover_letter(
+        cover_letter = await generator.generate_cover_letter(
             resume_data=request.resume_data,
             job_data=request.job_data,
-            tone=request.tone
+            tone=request.tone,
+            model_override=request.model
         )
         
         return {
@@ -59,13 +87,125 @@ async def generate_cover_letter(request: CoverLetterRequest):
         )
 
 
+@router.post("/generate-stream")
+async def stream_cover_letter(
+    request: CoverLetterRequest,
+    generator: CoverLetterGenerator = Depends(get_cover_letter_generator)
+):
+    """
+    Generate a cover letter and stream the text as it is written
+    
+    Args:
+        request: Resume data, job data, and tone
+        generator: Shared cover letter generator
+        
+    Returns:
+        text/plain stream of the cover letter
+    """
+    _validate_model(request.model)
+    
+    chunks = generator.stream_cover_letter(
+        resume_data=request.resume_data,
+        job_data=request.job_data,
+        tone=request.tone,
+        model_override=request.model
+    )
+    
+    # Wait for the first piece so setup errors still become a normal 500
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = ""
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error generating cover letter: {str(e)}"
+        )
+    
+    async def body():
+        try:
+            yield first
+            async for piece in chunks:
+                yield piece
+        finally:
+            # Client went away: stop the OpenAI stream
+            await chunks.aclose()
+    
+    # An explicit Content-Encoding makes GZipMiddleware pass chunks through unbuffered
+    return StreamingResponse(
+        body(),
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Encoding": "identity", "Cache-Control": "no-cache"}
+    )
+
+
+@router.post("/generate-batch")
+async def generate_cover_letters_batch(
+    request: BatchCoverLetterRequest,
+    generator: CoverLetterGenerator = Depends(get_cover_letter_generator)
+):
+    """
+    Generate cover letters for several jobs concurrently
+    
+    Args:
+        request: Resume data, list of jobs, and tone
+        generator: Shared cover letter generator
+        
+    Returns:
+        One result per job, in input order (errors are reported per job)
+    """
+    if len(request.jobs) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large (max {MAX_BATCH_SIZE} jobs)"
+        )
+    _validate_model(request.model)
+    
+    # Concurrency is capped inside the generator, shared across all requests
+    letters = await generator.generate_batch(
+        resume_data=request.resume_data,
+        jobs=request.jobs,
+        tone=request.tone,
+        model_override=request.model
+    )
+    
+    results = []
+    for job_data, letter in zip(request.jobs, letters):
+        if isinstance(letter, Exception):
+            results.append({
+                "job_title": job_data.get("title"),
+                "company": job_data.get("company"),
+                "status": "error",
+                "error": str(letter)
+            })
+        else:
+            results.append({
+                "job_title": job_data.get("title"),
+                "company": job_data.get("company"),
+                "status": "success",
+                "cover_letter": letter,
+                "word_count": len(letter.split())
+            })
+    
+    return {
+        "status": "success",
+        "tone": request.tone,
+        "total": len(results),
+        "results": results
+    }
+
+
 @router.post("/generate-simple")
-async def generate_cover_letter_simple(request: SimpleCoverLetterRequest):
+async def generate_cover_letter_simple(
+    request: SimpleCoverLetterRequest,
+    generator: CoverLetterGenerator = Depends(get_cover_letter_generator)
+):
     """
     Generate a cover letter with simplified input
     
     Args:
         request: Job details and resume ID
+        generator: Shared cover letter generator
         
     Returns:
         Generated cover letter
@@ -85,7 +225,7 @@ async def generate_cover_letter_simple(request: SimpleCoverLetterRequest):
             "description": request.job_description
         }
         
-        cover_letter = generator.generate_cover_letter(
+        cover_letter = await generator.generate_cover_letter(
             resume_data=resume_data,
             job_data=job_data,
             tone=request.tone
@@ -0,0 +1,40 @@
+"""
+HTTP caching helpers for read endpoints
+Computes strong ETags and answers conditional GETs with 304 Not Modified
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+CACHE_CONTROL = "private, max-age=60"
+
+
+def make_etag(*parts) -> str:
+    """Build a quoted strong ETag from the values that identify a record version"""
+    digest = hashlib.md5("-".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Set caching headers and check the client's If-None-Match header
+
+    Args:
+        request: Incoming request
+        response: Response whose headers will be sent with the JSON body
+        etag: Current ETag of the resource
+
+    Returns:
+        A 304 response if the client's copy is current, otherwise None
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -2,17 +2,25 @@
 Job Analysis API Endpoints
 Analyzes job descriptions and saves results to database
 """
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, load_only, with_expression
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
+from collections import OrderedDict
+from datetime import datetime
+import hashlib
+import threading
+import time
+import uuid
 
 from app.services.hiring_detector import HiringDetector
-from app.database import get_db
+from app.dependencies import get_detector
+from app.api.http_cache import make_etag, not_modified
+from app.database import get_db, cached_count, invalidate_count, encode_cursor, apply_cursor
 from app.models.job_analysis import JobAnalysis
 
 router = APIRouter()
-detector = HiringDetector()
 
 
 class JobAnalysisRequest(BaseModel):
@@ -21,10 +29,82 @@ class JobAnalysisRequest(BaseModel):
     posted_date: Optional[str] = None  # ISO format: YYYY-MM-DD
     
 
+MAX_BATCH_SIZE = 100
+MAX_SCORE_BATCH_SIZE = 1000
+
+# Detector results are deterministic per (description, posted_date), so identical
+# postings reuse a recent analysis instead of re-running the detector
+ANALYSIS_CACHE_SIZE = 10_000
+ANALYSIS_CACHE_TTL = 3600
+_analysis_cache: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+
+def _analyze_cached(
+    detector: HiringDetector,
+    request: JobAnalysisRequest,
+    now: Optional[datetime] = None
+) -> Dict:
+    """Run the hiring detector, reusing a cached result for identical postings"""
+    now = now or datetime.now()
+    # Posting age depends on the caller's clock, so dated postings are only reused within one day
+    day = now.date().isoformat() if request.posted_date else ""
+    key = hashlib.blake2b(
+        f"{request.job_description}|{request.posted_date or ''}|{day}".encode("utf-8"),
+        digest_size=16
+    ).digest()
+    cached_at = time.monotonic()
+    
+    with _analysis_cache_lock:
+        cached = _analysis_cache.get(key)
+        if cached and cached_at - cached[0] < ANALYSIS_CACHE_TTL:
+            _analysis_cache.move_to_end(key)
+            return cached[1]
+    
+    analysis = detector.analyze_hiring_type(
+        job_description=request.job_description,
+        posted_date=request.posted_date,
+        now=now
+    )
+    
+    with _analysis_cache_lock:
+        _analysis_cache[key] = (cached_at, analysis)
+        _analysis_cache.move_to_end(key)
+        while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    
+    return analysis
+
+
+def _analysis_record(request: JobAnalysisRequest, analysis: Dict) -> Dict:
+    """Map a detector result onto JobAnalysis column values"""
+    return {
+        "job_description": request.job_description,
+        "posted_date": request.posted_date,
+        "hiring_type": analysis["hiring_type"],
+        "confidence": analysis["confidence"],
+        "explanation": analysis["explanation"],
+        "active_score": analysis["active_score"],
+        "passive_score": analysis["passive_score"],
+        "red_flag_score": analysis["red_flag_score"],
+        "active_indicators": analysis["active_indicators"],
+        "passive_indicators": analysis["passive_indicators"],
+        "red_flags": analysis["red_flags"],
+        "requisition_analysis": analysis["requisition_analysis"],
+        "location_analysis": analysis["location_analysis"],
+        "specificity_analysis": analysis["specificity_analysis"],
+        "posting_age_days": analysis["posting_age_days"],
+        "is_stale": str(analysis["is_stale"]),
+        "insights": analysis["insights"],
+        "application_strategy": analysis["application_strategy"]
+    }
+
+
 @router.post("/analyze")
-async def analyze_job(
+def analyze_job(
     request: JobAnalysisRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    detector: HiringDetector = Depends(get_detector)
 ) -> Dict:
     """
     Analyze a job posting and save to database
@@ -32,42 +112,22 @@ async def analyze_job(
     Args:
         request: Job description and optional posting date
         db: Database session
+        detector: Shared hiring detector
         
     Returns:
         Complete hiring type analysis with application strategy
     """
     try:
         # Analyze the job
-        analysis = detector.analyze_hiring_type(
-            job_description=request.job_description,
-            posted_date=request.posted_date
-        )
+        analysis = _analyze_cached(detector, request)
         
         # Save to database
-        job_analysis = JobAnalysis(
-            job_description=request.job_description,
-            posted_date=request.posted_date,
-            hiring_type=analysis["hiring_type"],
-            confidence=analysis["confidence"],
-            explanation=analysis["explanation"],
-            active_score=analysis["active_score"],
-            passive_score=analysis["passive_score"],
-            red_flag_score=analysis["red_flag_score"],
-            active_indicators=analysis["active_indicators"],
-            passive_indicators=analysis["passive_indicators"],
-            red_flags=analysis["red_flags"],
-            requisition_analysis=analysis["requisition_analysis"],
-            location_analysis=analysis["location_analysis"],
-            specificity_analysis=analysis["specificity_analysis"],
-            posting_age_days=analysis["posting_age_days"],
-            is_stale=str(analysis["is_stale"]),
-            insights=analysis["insights"],
-            application_strategy=analysis["application_strategy"]
-        )
+        job_analysis = JobAnalysis(**_analysis_record(request, analysis))
         
         db.add(job_analysis)
         db.commit()
         db.refresh(job_analysis)
+        invalidate_count(JobAnalysis)
         
         return {
             "status": "success",
@@ -84,23 +144,130 @@ async def analyze_job(
         )
 
 
+@router.post("/analyze-batch")
+def analyze_jobs_batch(
+    requests: List[JobAnalysisRequest],
+    db: Session = Depends(get_db),
+    detector: HiringDetector = Depends(get_detector)
+) -> Dict:
+    """
+    Analyze several job postings and save them in a single transaction
+    
+    Args:
+        requests: List of job descriptions with optional posting dates
+        db: Database session
+        detector: Shared hiring detector
+        
+    Returns:
+        Analyses in the same order as the input
+    """
+    if len(requests) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large (max {MAX_BATCH_SIZE} postings)"
+        )
+    
+    try:
+        results = []
+        rows = []
+        # One reference time so every posting's age is measured consistently
+        now = datetime.now()
+        for request in requests:
+            analysis = _analyze_cached(detector, request, now)
+            analysis_id = str(uuid.uuid4())
+            rows.append({"id": analysis_id, **_analysis_record(request, analysis)})
+            results.append({"analysis_id": analysis_id, "analysis": analysis})
+        
+        # One multi-row INSERT and one commit for the whole batch
+        if rows:
+            db.execute(insert(JobAnalysis), rows)
+            db.commit()
+            invalidate_count(JobAnalysis)
+        
+        return {
+            "status": "success",
+            "message": f"{len(results)} job analyses saved to database",
+            "total": len(results),
+            "results": results
+        }
+        
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error analyzing job postings: {str(e)}"
+        )
+
+
+@router.post("/score-batch")
+def score_jobs_batch(
+    requests: List[JobAnalysisRequest],
+    detector: HiringDetector = Depends(get_detector)
+) -> Dict:
+    """
+    Score many job postings without saving them (hiring type and scores only)
+    
+    Args:
+        requests: List of job descriptions with optional posting dates
+        detector: Shared hiring detector
+        
+    Returns:
+        Scores in the same order as the input
+    """
+    if len(requests) > MAX_SCORE_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large (max {MAX_SCORE_BATCH_SIZE} postings)"
+        )
+    
+    try:
+        scores = detector.score_batch(
+            [request.job_description for request in requests],
+            [request.posted_date for request in requests]
+        )
+        
+        return {
+            "status": "success",
+            "total": len(scores),
+            "scores": scores
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error scoring job postings: {str(e)}"
+        )
+
+
 @router.get("/{analysis_id}")
-async def get_job_analysis(analysis_id: str, db: Session = Depends(get_db)) -> Dict:
+def get_job_analysis(
+    analysis_id: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+) -> Dict:
     """
     Get a job analysis by ID
     
     Args:
         analysis_id: UUID of the analysis
+        request: Incoming request (for If-None-Match)
+        response: Outgoing response (for ETag/Cache-Control)
         db: Database session
         
     Returns:
-        Job analysis data
+        Job analysis data, or 304 if the client's cached copy is current
     """
     analysis = db.query(JobAnalysis).filter(JobAnalysis.id == analysis_id).first()
     
     if not analysis:
         raise HTTPException(status_code=404, detail="Job analysis not found")
     
+    # Analyses are never updated after insert, so created_at identifies the version
+    cached = not_modified(request, response, make_etag(analysis.id, analysis.created_at))
+    if cached:
+        return cached
+    
     return {
         "status": "success",
         "analysis": analysis.to_dict()
@@ -108,9 +275,11 @@ async def get_job_analysis(analysis_id: str, db: Session = Depends(get_db)) -> D
 
 
 @router.get("/")
-async def list_job_analyses(
+def list_job_analyses(
     limit: int = 10,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: Session = Depends(get_db)
 ) -> Dict:
     """
@@ -118,20 +287,41 @@ async def list_job_analyses(
     
     Args:
         limit: Number of results
-        offset: Results to skip
+        offset: Results to skip (ignored when cursor is given)
+        cursor: Keyset cursor from a previous page's next_cursor
+        include_total: Whether to return the (cached) total count
         db: Database session
         
     Returns:
         List of job analyses
     """
-    analyses = db.query(JobAnalysis).order_by(JobAnalysis.created_at.desc()).limit(limit).offset(offset).all()
-    total = db.query(JobAnalysis).count()
+    # Only load the columns to_dict serializes, not the detailed JSON breakdowns,
+    # and let the database truncate job_description instead of shipping the full text
+    query = (
+        db.query(JobAnalysis)
+        .options(
+            load_only(*JobAnalysis.summary_columns()),
+            with_expression(JobAnalysis.job_description_preview, JobAnalysis.preview_expression())
+        )
+        .order_by(JobAnalysis.created_at.desc(), JobAnalysis.id.desc())
+    )
+    
+    if cursor:
+        try:
+            query = apply_cursor(query, JobAnalysis, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    else:
+        query = query.offset(offset)
+    
+    analyses = query.limit(limit).all()
     
     return {
         "status": "success",
-        "total": total,
+        "total": cached_count(db, JobAnalysis) if include_total else None,
         "limit": limit,
         "offset": offset,
+        "next_cursor": encode_cursor(analyses[-1]) if len(analyses) == limit else None,
         "analyses": [analysis.to_dict() for analysis in analyses]
     }
 
@@ -1,17 +1,31 @@
 """
 Semantic Job Matching API Endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
+from collections import OrderedDict
+import threading
+import uuid
 
 from app.services.semantic_matcher import SemanticMatcher
+from app.dependencies import get_matcher
 from app.database import get_db
 from app.models.resume import Resume
 
 router = APIRouter()
-matcher = SemanticMatcher()
+
+# In-process store for background ranking jobs (per worker; use Redis for multi-worker)
+MAX_MATCH_JOBS = 1000
+match_jobs: "OrderedDict[str, Dict]" = OrderedDict()
+match_jobs_lock = threading.Lock()
+
+
+def _validate_top_k(top_k: Optional[int]) -> None:
+    """Reject a top_k that can't select any jobs"""
+    if top_k is not None and top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be at least 1")
 
 
 class JobMatchRequest(BaseModel):
@@ -27,6 +41,7 @@ class MultiJobMatchRequest(BaseModel):
     resume_text: str
     jobs: List[dict]  # Each dict should have: id, title, company, description
     resume_id: Optional[str] = None
+    top_k: Optional[int] = None  # Only return the best top_k matches
 
 
 class ResumeIdMatchRequest(BaseModel):
@@ -36,12 +51,16 @@ class ResumeIdMatchRequest(BaseModel):
 
 
 @router.post("/match")
-async def match_resume_to_job(request: JobMatchRequest):
+def match_resume_to_job(
+    request: JobMatchRequest,
+    matcher: SemanticMatcher = Depends(get_matcher)
+):
     """
     Match a resume to a single job using semantic similarity
     
     Args:
         request: Resume text and job description
+        matcher: Shared semantic matcher
         
     Returns:
         Match score and recommendation
@@ -67,26 +86,33 @@ async def match_resume_to_job(request: JobMatchRequest):
 
 
 @router.post("/match-multiple")
-async def match_resume_to_multiple_jobs(request: MultiJobMatchRequest):
+def match_resume_to_multiple_jobs(
+    request: MultiJobMatchRequest,
+    matcher: SemanticMatcher = Depends(get_matcher)
+):
     """
     Match a resume to multiple jobs and rank them
     
     Args:
         request: Resume text and list of jobs
+        matcher: Shared semantic matcher
         
     Returns:
         Ranked list of job matches
     """
+    _validate_top_k(request.top_k)
+    
     try:
         matches = matcher.match_resume_to_multiple_jobs(
             resume_text=request.resume_text,
             jobs=request.jobs,
-            resume_id=request.resume_id
+            resume_id=request.resume_id,
+            top_k=request.top_k
         )
         
         return {
             "status": "success",
-            "total_jobs": len(matches),
+            "total_jobs": len(request.jobs),
             "matches": matches
         }
         
@@ -97,10 +123,98 @@ async def match_resume_to_multiple_jobs(request: MultiJobMatchRequest):
         )
 
 
+def _run_match_job(
+    job_id: str,
+    matcher: SemanticMatcher,
+    resume_text: str,
+    jobs: List[dict],
+    resume_id: Optional[str],
+    top_k: Optional[int] = None
+) -> None:
+    """Rank jobs for a background match job and record the outcome"""
+    with match_jobs_lock:
+        match_jobs[job_id]["status"] = "running"
+    
+    try:
+        matches = matcher.match_resume_to_multiple_jobs(
+            resume_text=resume_text,
+            jobs=jobs,
+            resume_id=resume_id,
+            top_k=top_k
+        )
+        update = {"status": "completed", "total_jobs": len(jobs), "matches": matches}
+    except Exception as e:
+        update = {"status": "failed", "error": str(e)}
+    
+    with match_jobs_lock:
+        if job_id in match_jobs:
+            match_jobs[job_id].update(update)
+
+
+@router.post("/match-multiple/async", status_code=202)
+def submit_match_multiple_job(
+    request: MultiJobMatchRequest,
+    background_tasks: BackgroundTasks,
+    matcher: SemanticMatcher = Depends(get_matcher)
+):
+    """
+    Queue a resume-to-jobs ranking in the background (for large job lists)
+    
+    Args:
+        request: Resume text and list of jobs
+        background_tasks: FastAPI background task runner
+        matcher: Shared semantic matcher
+        
+    Returns:
+        Job ID to poll at GET /match-multiple/{job_id}
+    """
+    _validate_top_k(request.top_k)
+    
+    job_id = uuid.uuid4().hex
+    
+    with match_jobs_lock:
+        match_jobs[job_id] = {"status": "queued", "total_jobs": len(request.jobs)}
+        # Drop the oldest jobs once the store is full
+        while len(match_jobs) > MAX_MATCH_JOBS:
+            match_jobs.popitem(last=False)
+    
+    background_tasks.add_task(
+        _run_match_job, job_id, matcher, request.resume_text, request.jobs, request.resume_id,
+        request.top_k
+    )
+    
+    return {
+        "status": "accepted",
+        "job_id": job_id
+    }
+
+
+@router.get("/match-multiple/{job_id}")
+def get_match_multiple_job(job_id: str):
+    """
+    Get the status (and results, once completed) of a background ranking job
+    
+    Args:
+        job_id: ID returned by POST /match-multiple/async
+        
+    Returns:
+        Job status with ranked matches when completed
+    """
+    with match_jobs_lock:
+        job = match_jobs.get(job_id)
+        job = dict(job) if job else None
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Match job not found")
+    
+    return {"job_id": job_id, **job}
+
+
 @router.post("/match-by-id")
-async def match_by_resume_id(
+def match_by_resume_id(
     request: ResumeIdMatchRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    matcher: SemanticMatcher = Depends(get_matcher)
 ):
     """
     Match a resume from database to a job
@@ -108,6 +222,7 @@ async def match_by_resume_id(
     Args:
         request: Resume ID and job description
         db: Database session
+        matcher: Shared semantic matcher
         
     Returns:
         Match score and recommendation
@@ -0,0 +1,80 @@
+"""
+Request body decompression
+Accepts gzip-encoded request bodies (Content-Encoding: gzip) from clients
+that compress large JSON payloads such as job descriptions
+"""
+import os
+import zlib
+
+from fastapi.responses import JSONResponse
+
+# Decompressed size cap, so a small gzip body can't expand without bound
+MAX_REQUEST_BODY_BYTES = int(os.getenv("MAX_REQUEST_BODY_MB", "5")) * 1024 * 1024
+
+
+class GzipRequestMiddleware:
+    """Pure ASGI middleware that inflates gzip request bodies before routing"""
+
+    def __init__(self, app, max_body_bytes: int = MAX_REQUEST_BODY_BYTES):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    @staticmethod
+    async def _too_large(scope, receive, send):
+        """Reject a body that inflates past the size cap"""
+        response = JSONResponse({"detail": "Request body too large"}, status_code=413)
+        await response(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if dict(scope["headers"]).get(b"content-encoding", b"").lower() != b"gzip":
+            await self.app(scope, receive, send)
+            return
+
+        # 16 + MAX_WBITS: expect a gzip header and trailer
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunks = []
+        size = 0
+        try:
+            more_body = True
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                more_body = message.get("more_body", False)
+                chunk = inflater.decompress(message.get("body", b""), self.max_body_bytes - size + 1)
+                size += len(chunk)
+                if size > self.max_body_bytes or inflater.unconsumed_tail:
+                    await self._too_large(scope, receive, send)
+                    return
+                chunks.append(chunk)
+            # Drain whatever zlib still buffers under the same cap; flush() has no output limit
+            chunk = inflater.decompress(b"", self.max_body_bytes - size + 1)
+            size += len(chunk)
+            if size > self.max_body_bytes or inflater.unconsumed_tail:
+                await self._too_large(scope, receive, send)
+                return
+            chunks.append(chunk)
+        except zlib.error:
+            response = JSONResponse({"detail": "Invalid gzip request body"}, status_code=400)
+            await response(scope, receive, send)
+            return
+
+        body = b"".join(chunks)
+        headers = [(k, v) for k, v in scope["headers"] if k not in (b"content-encoding", b"content-length")]
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        scope = dict(scope, headers=headers)
+
+        sent = False
+
+        async def receive_inflated():
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(scope, receive_inflated, send)
@@ -2,29 +2,195 @@
 Resume API Endpoints
 Handles resume upload, parsing, and analysis with database storage
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import Dict, List
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request, Response
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, defer, load_only
+from typing import Dict, List, Optional
+import asyncio
 import os
 import uuid
 from pathlib import Path
 
-from app.services.resume_parser import ResumeParser
-from app.database import get_db
+from app.services.resume_parser import ResumeParser, get_parse_pool, parse_resume_bytes_in_worker
+from app.dependencies import get_parser
+from app.api.http_cache import make_etag, not_modified
+from app.database import get_db, cached_count, invalidate_count, encode_cursor, apply_cursor
 from app.models.resume import Resume
 
 router = APIRouter()
-parser = ResumeParser()
 
 # Create uploads directory if it doesn't exist
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+# Upload limits
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "10")) * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_FILENAME_LENGTH = 255
+MAX_BATCH_UPLOADS = 10
+MAX_BATCH_DELETES = 100
+
+
+class BatchDeleteRequest(BaseModel):
+    """Request model for deleting several resumes at once"""
+    ids: List[str]
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds MAX_UPLOAD_BYTES"""
+
+
+def _read_upload(src) -> bytes:
+    """
+    Read an uploaded file into memory in fixed-size chunks (blocking, run in threadpool)
+    
+    Raises:
+        UploadTooLarge: If the upload exceeds MAX_UPLOAD_BYTES
+    """
+    chunks = []
+    total = 0
+    while chunk := src.read(UPLOAD_CHUNK_SIZE):
+        total += len(chunk)
+        if total > MAX_UPLOAD_BYTES:
+            raise UploadTooLarge()
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _write_file(contents: bytes, path: Path) -> None:
+    """Write the original upload to the file store (blocking, run in threadpool)"""
+    with open(path, "wb") as f:
+        f.write(contents)
+
+
+def _save_resume(db: Session, resume: Resume) -> None:
+    """Persist a resume record (blocking, run in threadpool)"""
+    db.add(resume)
+    db.commit()
+    db.refresh(resume)
+    invalidate_count(Resume)
+
+
+def _remove_file(path: str) -> None:
+    """Delete a stored upload, warning instead of failing if it can't be removed"""
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+    except Exception as e:
+        print(f"Warning: Could not delete file {path}: {e}")
+
+
+def _delete_resume_record(db: Session, resume: Resume) -> None:
+    """Remove a just-saved resume record (blocking, run in threadpool)"""
+    db.delete(resume)
+    db.commit()
+    invalidate_count(Resume)
+
+
+def _validate_upload(file: UploadFile) -> None:
+    """Reject uploads that aren't PDFs or have unusable filenames"""
+    if not file.filename or not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+    
+    if len(file.filename) > MAX_FILENAME_LENGTH:
+        raise HTTPException(status_code=400, detail="Filename is too long")
+
+
+async def _read_and_parse(file: UploadFile, parser: ResumeParser) -> tuple:
+    """
+    Read an upload into memory and parse it, both off the event loop
+    
+    Returns:
+        (contents, parse result)
+    
+    Raises:
+        HTTPException: 413 if the upload exceeds MAX_UPLOAD_BYTES
+    """
+    try:
+        contents = await run_in_threadpool(_read_upload, file.file)
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)"
+        )
+    
+    # Parse straight from memory off the event loop so other requests keep flowing;
+    # with PARSE_WORKERS set, in a worker process so concurrent uploads use every core
+    parse_pool = get_parse_pool()
+    if parse_pool is not None:
+        result = await asyncio.get_running_loop().run_in_executor(
+            parse_pool, parse_resume_bytes_in_worker, contents
+        )
+    else:
+        result = await run_in_threadpool(parser.parse_resume_bytes, contents)
+    return contents, result
+
+
+async def _store_upload(db: Session, filename: str, contents: bytes, result: Dict) -> Dict:
+    """
+    Save a parsed upload to the file store and database
+    
+    Args:
+        db: Database session
+        filename: Original upload filename
+        contents: Raw PDF bytes
+        result: Parser output for the PDF
+        
+    Returns:
+        Upload response body for the saved resume
+    """
+    # Generate unique filename (extension is always .pdf after validation)
+    file_id = uuid.uuid4().hex
+    file_path = UPLOAD_DIR / f"{file_id}.pdf"
+    parsed_data = result["parsed_data"]
+    
+    # Create database record
+    resume = Resume(
+        id=file_id,
+        original_filename=filename,
+        file_path=str(file_path),
+        raw_text=parsed_data.get("raw_text"),
+        email=parsed_data.get("email"),
+        phone=parsed_data.get("phone"),
+        skills=parsed_data.get("skills", []),
+        education=parsed_data.get("education", []),
+        word_count=parsed_data.get("word_count"),
+        ats_score=result.get("ats_score"),
+        suggestions=result.get("suggestions", [])
+    )
+    
+    # Only keep the original once parsing succeeded; store it and save the record in parallel
+    write_result, save_result = await asyncio.gather(
+        run_in_threadpool(_write_file, contents, file_path),
+        run_in_threadpool(_save_resume, db, resume),
+        return_exceptions=True
+    )
+    if isinstance(save_result, Exception):
+        file_path.unlink(missing_ok=True)
+        raise save_result
+    if isinstance(write_result, Exception):
+        # Don't leave a record pointing at a missing file
+        await run_in_threadpool(_delete_resume_record, db, resume)
+        file_path.unlink(missing_ok=True)
+        raise write_result
+    
+    return {
+        "status": "success",
+        "message": "Resume uploaded and saved to database",
+        "resume_id": file_id,
+        "original_filename": filename,
+        "parsed_data": parsed_data,
+        "ats_score": result.get("ats_score"),
+        "suggestions": result.get("suggestions")
+    }
+
 
 @router.post("/upload")
 async def upload_resume(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    parser: ResumeParser = Depends(get_parser)
 ) -> Dict:
     """
     Upload and parse a resume PDF, then save to database
@@ -32,120 +198,169 @@ async def upload_resume(
     Args:
         file: PDF file upload
         db: Database session
+        parser: Shared resume parser
         
     Returns:
         Parsed resume data with ATS score and suggestions
     """
-    # Validate file type
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+    _validate_upload(file)
     
     try:
-        # Generate unique filename
-        file_id = str(uuid.uuid4())
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{file_id}{file_extension}"
-        file_path = UPLOAD_DIR / unique_filename
-        
-        # Save uploaded file
-        contents = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(contents)
-        
-        # Parse the resume
-        result = parser.parse_resume(str(file_path))
-        parsed_data = result["parsed_data"]
-        
-        # Create database record
-        resume = Resume(
-            id=file_id,
-            original_filename=file.filename,
-            file_path=str(file_path),
-            raw_text=parsed_data.get("raw_text"),
-            email=parsed_data.get("email"),
-            phone=parsed_data.get("phone"),
-            skills=parsed_data.get("skills", []),
-            education=parsed_data.get("education", []),
-            word_count=parsed_data.get("word_count"),
-            ats_score=result.get("ats_score"),
-            suggestions=result.get("suggestions", [])
-        )
-        
-        # Save to database
-        db.add(resume)
-        db.commit()
-        db.refresh(resume)
-        
-        # Return result
-        return {
-            "status": "success",
-            "message": "Resume uploaded and saved to database",
-            "resume_id": file_id,
-            "original_filename": file.filename,
-            "parsed_data": parsed_data,
-            "ats_score": result.get("ats_score"),
-            "suggestions": result.get("suggestions")
-        }
+        contents, result = await _read_and_parse(file, parser)
+        return await _store_upload(db, file.filename, contents, result)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
 
 
+@router.post("/upload-batch")
+async def upload_resumes_batch(
+    files: List[UploadFile] = File(...),
+    db: Session = Depends(get_db),
+    parser: ResumeParser = Depends(get_parser)
+) -> Dict:
+    """
+    Upload and parse several resume PDFs in one request
+    
+    Args:
+        files: PDF file uploads
+        db: Database session
+        parser: Shared resume parser
+        
+    Returns:
+        One result per file, in upload order (errors are reported per file)
+    """
+    if len(files) > MAX_BATCH_UPLOADS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large (max {MAX_BATCH_UPLOADS} files)"
+        )
+    
+    async def read_and_parse(file: UploadFile) -> tuple:
+        _validate_upload(file)
+        return await _read_and_parse(file, parser)
+    
+    # Parsing is independent per file, so run it concurrently; the shared db session
+    # isn't safe across threads, so records are then saved one at a time
+    parsed = await asyncio.gather(*(read_and_parse(f) for f in files), return_exceptions=True)
+    
+    results = []
+    for file, outcome in zip(files, parsed):
+        try:
+            if isinstance(outcome, Exception):
+                raise outcome
+            contents, result = outcome
+            results.append(await _store_upload(db, file.filename, contents, result))
+        except Exception as e:
+            await run_in_threadpool(db.rollback)
+            results.append({
+                "status": "error",
+                "original_filename": file.filename,
+                "error": e.detail if isinstance(e, HTTPException) else f"Error processing resume: {str(e)}"
+            })
+    
+    return {
+        "status": "success",
+        "total": len(results),
+        "results": results
+    }
+
+
 @router.get("/{resume_id}")
-async def get_resume(resume_id: str, db: Session = Depends(get_db)) -> Dict:
+def get_resume(
+    resume_id: str,
+    request: Request,
+    response: Response,
+    include: Optional[str] = None,
+    db: Session = Depends(get_db)
+) -> Dict:
     """
     Get a resume by ID from database
     
     Args:
         resume_id: UUID of the resume
+        request: Incoming request (for If-None-Match)
+        response: Outgoing response (for ETag/Cache-Control)
+        include: Set to "raw_text" to include the full resume text
         db: Database session
         
     Returns:
-        Resume data
+        Resume data, or 304 if the client's cached copy is current
     """
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    include_raw_text = include == "raw_text"
+    
+    query = db.query(Resume)
+    if not include_raw_text:
+        query = query.options(defer(Resume.raw_text))
+    resume = query.filter(Resume.id == resume_id).first()
     
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
+    etag = make_etag(resume.id, resume.updated_at, include_raw_text)
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    
     return {
         "status": "success",
-        "resume": resume.to_dict()
+        "resume": resume.to_dict(include_raw_text=include_raw_text)
     }
 
 
 @router.get("/")
-async def list_resumes(
+def list_resumes(
     limit: int = 10,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: Session = Depends(get_db)
 ) -> Dict:
     """
-    List all resumes with pagination
+    List all resumes with pagination (without raw_text)
     
     Args:
         limit: Number of results to return
-        offset: Number of results to skip
+        offset: Number of results to skip (ignored when cursor is given)
+        cursor: Keyset cursor from a previous page's next_cursor
+        include_total: Whether to return the (cached) total count
         db: Database session
         
     Returns:
         List of resumes
     """
-    resumes = db.query(Resume).order_by(Resume.created_at.desc()).limit(limit).offset(offset).all()
-    total = db.query(Resume).count()
+    # raw_text can be tens of KB per row; list views never need it
+    query = (
+        db.query(Resume)
+        .options(defer(Resume.raw_text))
+        .order_by(Resume.created_at.desc(), Resume.id.desc())
+    )
+    
+    if cursor:
+        try:
+            query = apply_cursor(query, Resume, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    else:
+        query = query.offset(offset)
+    
+    resumes = query.limit(limit).all()
     
     return {
         "status": "success",
-        "total": total,
+        "total": cached_count(db, Resume) if include_total else None,
         "limit": limit,
         "offset": offset,
+        "next_cursor": encode_cursor(resumes[-1]) if len(resumes) == limit else None,
         "resumes": [resume.to_dict() for resume in resumes]
     }
 
 
 @router.delete("/{resume_id}")
-async def delete_resume(resume_id: str, db: Session = Depends(get_db)) -> Dict:
+def delete_resume(resume_id: str, db: Session = Depends(get_db)) -> Dict:
     """
     Delete a resume by ID
     
@@ -161,16 +376,14 @@ async def delete_resume(resume_id: str, db: Session = Depends(get_db)) -> Dict:
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    # Delete file from disk
-    try:
-        if os.path.exists(resume.file_path):
-            os.remove(resume.file_path)
-    except Exception as e:
-        print(f"Warning: Could not delete file {resume.file_path}: {e}")
-    
-    # Delete from database
+    # Delete from database first, so a failed commit never leaves a row without its file
+    file_path = resume.file_path
     db.delete(resume)
     db.commit()
+    invalidate_count(Resume)
+    
+    # Delete file from disk (failures are only logged; the row is already gone)
+    _remove_file(file_path)
     
     return {
         "status": "success",
@@ -178,8 +391,54 @@ async def delete_resume(resume_id: str, db: Session = Depends(get_db)) -> Dict:
     }
 
 
+@router.post("/delete-batch")
+def delete_resumes_batch(request: BatchDeleteRequest, db: Session = Depends(get_db)) -> Dict:
+    """
+    Delete several resumes in one request and one transaction
+    
+    Args:
+        request: IDs of the resumes to delete
+        db: Database session
+        
+    Returns:
+        IDs that were deleted and IDs that weren't found
+    """
+    if len(request.ids) > MAX_BATCH_DELETES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large (max {MAX_BATCH_DELETES} resumes)"
+        )
+    
+    ids = list(dict.fromkeys(request.ids))
+    resumes = (
+        db.query(Resume)
+        .options(load_only(Resume.id, Resume.file_path))
+        .filter(Resume.id.in_(ids))
+        .all()
+    ) if ids else []
+    
+    deleted = {resume.id for resume in resumes}
+    file_paths = [resume.file_path for resume in resumes]
+    
+    # Commit the row deletes before touching disk, so a failed commit keeps every file
+    for resume in resumes:
+        db.delete(resume)
+    db.commit()
+    invalidate_count(Resume)
+    
+    # Failures are only logged; the rows are already gone
+    for file_path in file_paths:
+        _remove_file(file_path)
+    
+    return {
+        "status": "success",
+        "deleted": [rid for rid in ids if rid in deleted],
+        "not_found": [rid for rid in ids if rid not in deleted]
+    }
+
+
 @router.get("/test")
-async def test_endpoint():
+async def test_endpoint(parser: ResumeParser = Depends(get_parser)):
     """Test endpoint to verify API is working"""
     return {
         "message": "Resume API is working!",
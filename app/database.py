@@ -1,10 +1,13 @@
 """
 Database configuration and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, and_, or_, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Query
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,11 +15,27 @@ load_dotenv()
 # Get database URL from environment or use SQLite
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./resume_ai.db")
 
+# Connection pool sizing (server databases only)
+# Sync handlers run in the threadpool, so size the pool for
+# uvicorn --workers x concurrent requests per worker to avoid QueuePool timeouts
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
 # Create engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+if "sqlite" in DATABASE_URL:
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False}
+    )
+else:
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=DB_POOL_RECYCLE
+    )
 
 # Create session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -25,6 +44,53 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def ensure_indexes():
+    """
+    Create any model indexes missing from existing tables
+    
+    create_all() skips tables that already exist, so indexes added to a
+    model later would never be created on an existing database.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def utcnow() -> datetime:
+    """
+    Client-side created_at default with microsecond precision
+    
+    SQLite's CURRENT_TIMESTAMP (server_default=func.now()) only stores whole
+    seconds, which leaves same-second rows tied and breaks keyset cursors.
+    """
+    return datetime.now(timezone.utc)
+
+
+def normalize_sqlite_timestamps(bind=None):
+    """
+    Pad second-precision created_at values written by CURRENT_TIMESTAMP
+    
+    SQLAlchemy stores SQLite datetimes as 'YYYY-MM-DD HH:MM:SS.ffffff', so
+    older 'YYYY-MM-DD HH:MM:SS' rows would compare as smaller than a cursor
+    from the same second and get repeated across pages.
+    
+    Args:
+        bind: Engine to normalize (defaults to the app engine)
+    """
+    bind = bind or engine
+    if bind.dialect.name != "sqlite":
+        return
+    
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if "created_at" not in table.c:
+                continue
+            conn.execute(text(
+                f"UPDATE {table.name} SET created_at = created_at || '.000000' "
+                "WHERE length(created_at) = 19"
+            ))
+
+
 def get_db():
     """
     Dependency function to get database session
@@ -34,4 +100,60 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Row counts for paginated list endpoints, cached per table for a short TTL
+COUNT_CACHE_TTL = 30
+_count_cache: Dict[str, Tuple[float, int]] = {}
+
+
+def cached_count(db, model) -> int:
+    """
+    Get the row count for a model, reusing a recent result
+    
+    SELECT count(*) scans the whole table, so list endpoints reuse the
+    last count for COUNT_CACHE_TTL seconds instead of issuing it per page.
+    """
+    table = model.__tablename__
+    cached = _count_cache.get(table)
+    now = time.monotonic()
+    if cached and now - cached[0] < COUNT_CACHE_TTL:
+        return cached[1]
+    
+    total = db.query(model).count()
+    _count_cache[table] = (now, total)
+    return total
+
+
+def invalidate_count(model) -> None:
+    """Drop the cached row count for a model after inserts/deletes"""
+    _count_cache.pop(model.__tablename__, None)
+
+
+def encode_cursor(row) -> Optional[str]:
+    """Build a keyset pagination cursor from a row's (created_at, id)"""
+    if row is None or row.created_at is None:
+        return None
+    return f"{row.created_at.isoformat()}|{row.id}"
+
+
+def apply_cursor(query: Query, model, cursor: Optional[str]) -> Query:
+    """
+    Restrict a created_at DESC, id DESC query to rows after a cursor
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return query
+    
+    created_at, _, row_id = cursor.partition("|")
+    created_at = datetime.fromisoformat(created_at)
+    return query.filter(
+        or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id)
+        )
+    )
+
@@ -0,0 +1,50 @@
+"""
+Shared service instances
+Services are built once in the app lifespan and stored on app.state
+Use with FastAPI Depends()
+"""
+from fastapi import Request
+
+from app.services.resume_parser import ResumeParser
+from app.services.hiring_detector import HiringDetector, detector as hiring_detector
+from app.services.semantic_matcher import SemanticMatcher
+from app.services.cover_letter_generator import CoverLetterGenerator
+
+
+def init_services(state) -> None:
+    """
+    Construct the service singletons and warm up the embedding model and tokenizer
+    Safe to call more than once; services are only loaded the first time
+
+    Args:
+        state: app.state to attach the services to
+    """
+    if getattr(state, "services_ready", False):
+        return
+
+    state.parser = ResumeParser()
+    state.detector = hiring_detector
+    state.matcher = SemanticMatcher()
+    state.cover_letter_generator = CoverLetterGenerator()
+
+    # Run one forward pass so the first real request doesn't pay for kernel setup
+    state.matcher.model.encode("warmup", show_progress_bar=False)
+    # The OpenAI client stays lazy, but the tokenizer file load must not land in an async handler
+    state.cover_letter_generator.load_tokenizer()
+    state.services_ready = True
+
+
+def get_parser(request: Request) -> ResumeParser:
+    return request.app.state.parser
+
+
+def get_detector(request: Request) -> HiringDetector:
+    return request.app.state.detector
+
+
+def get_matcher(request: Request) -> SemanticMatcher:
+    return request.app.state.matcher
+
+
+def get_cover_letter_generator(request: Request) -> CoverLetterGenerator:
+    return request.app.state.cover_letter_generator
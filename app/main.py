@@ -1,26 +1,37 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
+import os
 
 # Import database and models
-from app.database import engine, Base
+from app.database import engine, Base, ensure_indexes, normalize_sqlite_timestamps
+from app.dependencies import init_services
 from app.models import Resume, JobAnalysis
 
 # Import routers
 from app.api import resumes, jobs, cover_letters, matching
+from app.api.request_encoding import GzipRequestMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifecycle manager - runs on startup and shutdown
-    Creates database tables on startup
+    Creates database tables and loads shared services on startup
     """
     # Startup: Create all database tables
     print("🗄️  Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    ensure_indexes()
+    normalize_sqlite_timestamps()
     print("✅ Database initialized!")
     
+    # Startup: Load services once and share them via app.state
+    init_services(app.state)
+    print("✅ Services loaded!")
+    
     yield
     
     # Shutdown: cleanup if needed
@@ -31,18 +42,34 @@ app = FastAPI(
     title="AI Resume & Recruitment System",
     description="AI-powered resume optimization and job matching platform with hiring type detection",
     version="0.2.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
+# FRONTEND_ORIGIN is a comma-separated allowlist; no cookies are used, so no credentials.
+# Unset means the local Streamlit dev server only, never a wildcard
+FRONTEND_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("FRONTEND_ORIGIN", "http://localhost:8501").split(",")
+    if origin.strip()
+]
+print(f"🌐 CORS allowed origins: {', '.join(FRONTEND_ORIGINS)}")
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    allow_origins=FRONTEND_ORIGINS,
+    allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 
+# Compress text-heavy responses (resume text, job descriptions, analysis JSON)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Accept gzip-compressed request bodies (the frontend compresses large JSON payloads)
+app.add_middleware(GzipRequestMiddleware)
+
 # Include routers
 app.include_router(resumes.router, prefix="/api/v1/resumes", tags=["Resumes"])
 app.include_router(jobs.router, prefix="/api/v1/jobs", tags=["Jobs"])
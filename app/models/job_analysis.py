@@ -2,8 +2,9 @@
 Job Analysis database model
 """
 from sqlalchemy import Column, String, Float, Text, DateTime, JSON, Integer
+from sqlalchemy.orm import query_expression
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, utcnow
 import uuid
 
 
@@ -43,13 +44,36 @@ class JobAnalysis(Base):
     application_strategy = Column(JSON)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), index=True)
+    
+    # Truncated job_description, only populated by queries using preview_expression()
+    job_description_preview = query_expression()
+    
+    PREVIEW_LENGTH = 200
+    
+    @classmethod
+    def summary_columns(cls):
+        """Columns read by to_dict (job_description and the detailed JSON breakdowns are skipped)"""
+        return (
+            cls.id, cls.posted_date, cls.hiring_type,
+            cls.confidence, cls.explanation, cls.active_score, cls.passive_score,
+            cls.red_flag_score, cls.insights, cls.application_strategy, cls.created_at
+        )
+    
+    @classmethod
+    def preview_expression(cls):
+        """SQL expression truncating job_description in the database (one extra char to detect overflow)"""
+        return func.substr(cls.job_description, 1, cls.PREVIEW_LENGTH + 1)
     
     def to_dict(self):
         """Convert model to dictionary"""
+        description = self.job_description_preview
+        if description is None:
+            description = self.job_description
+        
         return {
             "analysis_id": self.id,
-            "job_description": self.job_description[:200] + "..." if len(self.job_description) > 200 else self.job_description,
+            "job_description": description[:self.PREVIEW_LENGTH] + "..." if len(description) > self.PREVIEW_LENGTH else description,
             "posted_date": self.posted_date,
             "hiring_type": self.hiring_type,
             "confidence": self.confidence,
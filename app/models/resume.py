@@ -3,7 +3,7 @@ Resume database model
 """
 from sqlalchemy import Column, String, Float, Text, DateTime, JSON
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, utcnow
 import uuid
 
 
@@ -29,23 +29,33 @@ class Resume(Base):
     suggestions = Column(JSON)  # List of suggestions
     
     # Metadata
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    def to_dict(self):
-        """Convert model to dictionary"""
+    def to_dict(self, include_raw_text: bool = False):
+        """
+        Convert model to dictionary
+        
+        Args:
+            include_raw_text: Include the full resume text (can be tens of KB).
+                Leave False when the column was deferred in the query so it
+                isn't lazy-loaded.
+        """
+        parsed_data = {
+            "email": self.email,
+            "phone": self.phone,
+            "skills": self.skills,
+            "education": self.education,
+            "word_count": self.word_count
+        }
+        if include_raw_text:
+            parsed_data = {"raw_text": self.raw_text, **parsed_data}
+        
         return {
             "resume_id": self.id,
             "original_filename": self.original_filename,
             "file_path": self.file_path,
-            "parsed_data": {
-                "raw_text": self.raw_text,
-                "email": self.email,
-                "phone": self.phone,
-                "skills": self.skills,
-                "education": self.education,
-                "word_count": self.word_count
-            },
+            "parsed_data": parsed_data,
             "ats_score": self.ats_score,
             "suggestions": self.suggestions,
             "created_at": self.created_at.isoformat() if self.created_at else None,
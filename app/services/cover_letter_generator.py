@@ -1,27 +1,182 @@
 """
 AI Cover Letter Generator using OpenAI
 """
-from openai import OpenAI
+from openai import AsyncOpenAI, RateLimitError
+import asyncio
+import hashlib
+import httpx
+import json
 import os
-from typing import Dict
+import string
+import time
+from collections import OrderedDict
+from functools import cached_property
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    import tiktoken
+except ImportError:  # Fall back to a ~4 chars/token estimate
+    tiktoken = None
+
+# Deployed containers get the key from the environment; only read .env for local runs
+if not os.getenv("OPENAI_API_KEY"):
+    load_dotenv()
+
+# Account limits for the OpenAI model in use (requests / tokens per minute)
+OPENAI_MAX_RPM = int(os.getenv("OPENAI_MAX_RPM", "500"))
+OPENAI_MAX_TPM = int(os.getenv("OPENAI_MAX_TPM", "200000"))
+
+# Keep-alive pool for the OpenAI client (httpx's defaults cap keep-alive at 20 connections)
+OPENAI_MAX_CONNECTIONS = 100
+OPENAI_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Attempts per letter when OpenAI still answers 429, and how long everyone backs off after one
+MAX_ATTEMPTS = 3
+SECONDS_TO_PAUSE_AFTER_RATE_LIMIT_ERROR = 15
+
+# Token budgets for the variable parts of the prompt
+JOB_DESCRIPTION_TOKEN_BUDGET = 180
+LONG_POSTING_JOB_DESCRIPTION_TOKEN_BUDGET = 600
+SKILLS_TOKEN_BUDGET = 40
+
+# Letters for identical prompts are reused instead of paying for another completion
+COVER_LETTER_CACHE_SIZE = 1024
+COVER_LETTER_CACHE_TTL = 86400
+
+
+# Model routing: most postings go to the fast, cheap model; long postings (more
+# requirements to address) go to the larger one. Tiers are ordered most capable first,
+# and a rate-limited call falls back to the next tier down.
+MODEL_TIERS = ("gpt-4o", "gpt-4o-mini")
+MODEL = "gpt-4o-mini"
+LONG_POSTING_MODEL = "gpt-4o"
+LONG_POSTING_TOKENS = 900
+# A 300-word letter is ~400 tokens; the cap only guards against runaway output
+MAX_TOKENS = 450
+# The prompt forbids a sign-off; if the model writes one anyway, cut generation there
+STOP_SEQUENCES = ["\nSincerely,", "\nBest regards,", "\nKind regards,", "\nWarm regards,"]
+
+# Static instructions, kept as one fixed system message so the same prefix is sent on every call
+SYSTEM_PROMPT = """You are an expert career coach writing compelling cover letters.
+Write a cover letter of 250-300 words in the requested tone that:
+1. Opens with enthusiasm for the specific role and company
+2. Highlights 2-3 relevant experiences matching the job requirements
+3. Connects the candidate's skills to the company's needs
+4. Shows genuine interest in the company/industry
+5. Closes with a strong call to action
+Tones: professional = formal, business-appropriate, confident; enthusiastic = energetic, passionate, still professional; formal = traditional corporate language.
+Write in first person ("I am excited to apply..."), concise and impactful.
+Start directly with the opening paragraph. No name/address/date placeholders, no salutation, no signature line."""
+
+# User message for one letter; the resume fields are rendered once per resume
+_PROMPT_TPL = string.Template("""Candidate: $candidate_name
+Skills: $skills
+Experience: $experience
+Position: $job_title
+Company: $company
+Job description: $job_description
+Tone: $tone""")
+
+
+class _Throttle:
+    """
+    Request and token buckets that refill continuously up to the per-minute limits
+    (same scheme as the OpenAI cookbook's api_request_parallel_processor)
+    """
+    
+    def __init__(self, max_requests_per_minute: int, max_tokens_per_minute: int):
+        self.max_rpm = max_requests_per_minute
+        self.max_tpm = max_tokens_per_minute
+        self.available_rpm = float(max_requests_per_minute)
+        self.available_tpm = float(max_tokens_per_minute)
+        self.last_update_time = time.monotonic()
+        self.paused_until = 0.0
+    
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.last_update_time
+        self.available_rpm = min(self.max_rpm, self.available_rpm + elapsed * self.max_rpm / 60)
+        self.available_tpm = min(self.max_tpm, self.available_tpm + elapsed * self.max_tpm / 60)
+        self.last_update_time = now
+    
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request and `tokens` tokens are available, then take them"""
+        # Never ask for more than a full bucket, or we'd wait forever
+        tokens = min(tokens, self.max_tpm)
+        while True:
+            now = time.monotonic()
+            if now >= self.paused_until:
+                self._refill(now)
+                if self.available_rpm >= 1 and self.available_tpm >= tokens:
+                    self.available_rpm -= 1
+                    self.available_tpm -= tokens
+                    return
+            await asyncio.sleep(0.01)
+    
+    def cool_down(self) -> None:
+        """Hold all requests for a while after OpenAI reports a rate limit"""
+        self.paused_until = time.monotonic() + SECONDS_TO_PAUSE_AFTER_RATE_LIMIT_ERROR
+
 
 class CoverLetterGenerator:
-    def __init__(self):
-        """Initialize OpenAI API"""
+    def __init__(
+        self,
+        max_concurrency: int = 20,
+        max_requests_per_minute: int = OPENAI_MAX_RPM,
+        max_tokens_per_minute: int = OPENAI_MAX_TPM
+    ):
+        """
+        Initialize generator settings (the OpenAI client is created on first use)
+        
+        Args:
+            max_concurrency: Max in-flight OpenAI requests across all callers
+            max_requests_per_minute: Request budget to stay under (account RPM limit)
+            max_tokens_per_minute: Token budget to stay under (account TPM limit)
+        """
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._throttle = _Throttle(max_requests_per_minute, max_tokens_per_minute)
+        self._cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+    
+    @cached_property
+    def client(self) -> AsyncOpenAI:
+        """OpenAI client, built the first time a letter is generated"""
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
         
-        self.client = OpenAI(api_key=api_key)
+        # Retries on 429 are handled by the throttle instead of the SDK's own backoff
+        return AsyncOpenAI(
+            api_key=api_key,
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=OPENAI_MAX_CONNECTIONS
+                ),
+                timeout=OPENAI_TIMEOUT
+            )
+        )
+    
+    @cached_property
+    def _enc(self):
+        """Tokenizer, loaded by load_tokenizer() at startup (or the first time a prompt is built)"""
+        return self._load_encoding(MODEL)
     
-    def generate_cover_letter(
+    def load_tokenizer(self) -> None:
+        """
+        Load the tokenizer ahead of the first request
+        
+        tiktoken reads (and on a cold cache downloads) its encoding file, which
+        would otherwise block the event loop inside the first async generate call.
+        """
+        self._enc
+    
+    async def generate_cover_letter(
         self,
         resume_data: Dict,
         job_data: Dict,
-        tone: str = "professional"
+        tone: str = "professional",
+        model_override: Optional[str] = None
     ) -> str:
         """
         Generate a personalized cover letter
@@ -30,93 +185,269 @@ class CoverLetterGenerator:
             resume_data: Dictionary with parsed resume data
             job_data: Dictionary with job information
             tone: Tone of the letter (professional, enthusiastic, formal)
+            model_override: Use this model (one of MODEL_TIERS) instead of routing by posting size
             
         Returns:
             Generated cover letter text
         """
-        # Extract key information
-        candidate_name = resume_data.get('contact', {}).get('name', 'Candidate')
-        skills = resume_data.get('skills', [])
-        experience = resume_data.get('experience', [])
-        
-        job_title = job_data.get('title', 'Position')
-        company = job_data.get('company', 'Company')
-        job_description = job_data.get('description', '')
-        
-        # Build the prompt
-        prompt = f"""You are an expert career coach writing a compelling cover letter.
-
-**Candidate Information:**
-Name: {candidate_name}
-Top Skills: {', '.join(skills[:8])}
-Recent Experience: {self._summarize_experience(experience)}
-
-**Job Information:**
-Position: {job_title}
-Company: {company}
-Job Description: {job_description[:500]}
-
-**Instructions:**
-Write a {tone} cover letter (250-300 words) that:
-1. Opens with enthusiasm for the specific role and company
-2. Highlights 2-3 relevant experiences that match the job requirements
-3. Connects the candidate's skills to the company's needs
-4. Shows genuine interest in the company/industry
-5. Closes with a strong call to action
-
-**Tone Guidelines:**
-- Professional: Formal, business-appropriate, confident
-- Enthusiastic: Energetic, passionate, but still professional  
-- Formal: Very traditional, corporate language
-
-**Format:**
-Do NOT include:
-- [Your Name], [Your Address], [Date] (they'll add these themselves)
-- "Dear Hiring Manager" or salutation (they'll customize)
-- Signature line
-
-Start directly with the opening paragraph.
-Write in first person ("I am excited to apply...").
-Keep it concise and impactful.
-
-Generate the cover letter now:"""
-
+        return await self._generate_letter(self._resume_fields(resume_data), job_data, tone, model_override)
+    
+    async def _generate_letter(
+        self,
+        resume_fields: Dict[str, str],
+        job_data: Dict,
+        tone: str,
+        model_override: Optional[str]
+    ) -> str:
+        """generate_cover_letter with the resume fields already rendered"""
+        model = self._choose_model(job_data, model_override)
+        prompt = self._build_prompt(resume_fields, job_data, tone, model)
+        
+        # The prompt already holds every input the letter depends on (including tone)
+        cache_key = self._cache_key(model, SYSTEM_PROMPT, prompt)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Fast and cheap model
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert career coach and professional writer specializing in compelling cover letters."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,  # Balanced creativity
-                max_tokens=500
-            )
+            async with self._semaphore:
+                response = await self._create_completion(prompt, model)
             
-            return response.choices[0].message.content.strip()
+            cover_letter = response.choices[0].message.content.strip()
+            self._cache_put(cache_key, cover_letter)
+            return cover_letter
         
         except Exception as e:
             raise Exception(f"Error generating cover letter: {str(e)}")
     
+    async def stream_cover_letter(
+        self,
+        resume_data: Dict,
+        job_data: Dict,
+        tone: str = "professional",
+        model_override: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate a cover letter, yielding text as the model produces it
+        
+        Closing the iterator early (e.g. the client disconnects) closes the
+        OpenAI stream too, so no more output tokens are generated or billed
+        
+        Args:
+            resume_data: Dictionary with parsed resume data
+            job_data: Dictionary with job information
+            tone: Tone of the letter (professional, enthusiastic, formal)
+            model_override: Use this model (one of MODEL_TIERS) instead of routing by posting size
+            
+        Yields:
+            Pieces of the cover letter text
+        """
+        model = self._choose_model(job_data, model_override)
+        prompt = self._build_prompt(self._resume_fields(resume_data), job_data, tone, model)
+        
+        cache_key = self._cache_key(model, SYSTEM_PROMPT, prompt)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        parts = []
+        async with self._semaphore:
+            try:
+                stream = await self._create_completion(prompt, model, stream=True)
+            except Exception as e:
+                raise Exception(f"Error generating cover letter: {str(e)}")
+            
+            try:
+                async for chunk in stream:
+                    content = chunk.choices[0].delta.content if chunk.choices else None
+                    if content:
+                        parts.append(content)
+                        yield content
+            finally:
+                await stream.close()
+        
+        # Only reached when the stream ran to completion
+        self._cache_put(cache_key, "".join(parts).strip())
+    
+    def _choose_model(self, job_data: Dict, model_override: Optional[str] = None) -> str:
+        """
+        Pick the model for a letter
+        
+        Raises:
+            ValueError: If model_override is not one of MODEL_TIERS
+        """
+        if model_override:
+            if model_override not in MODEL_TIERS:
+                raise ValueError(f"Unsupported model '{model_override}' (choose from {', '.join(MODEL_TIERS)})")
+            return model_override
+        
+        if self._count_tokens(job_data.get('description', '')) > LONG_POSTING_TOKENS:
+            return LONG_POSTING_MODEL
+        return MODEL
+    
+    def _resume_fields(self, resume_data: Dict) -> Dict[str, str]:
+        """Prompt fields that depend only on the resume"""
+        return {
+            'candidate_name': resume_data.get('contact', {}).get('name', 'Candidate'),
+            'skills': self._join_skills(resume_data.get('skills', []), SKILLS_TOKEN_BUDGET),
+            'experience': self._summarize_experience(resume_data.get('experience', [])),
+        }
+    
+    def _build_prompt(self, resume_fields: Dict[str, str], job_data: Dict, tone: str, model: str = MODEL) -> str:
+        """User message for one letter (the fixed instructions live in SYSTEM_PROMPT)"""
+        # The larger model gets more of a long posting to work with
+        budget = (
+            LONG_POSTING_JOB_DESCRIPTION_TOKEN_BUDGET if model == LONG_POSTING_MODEL
+            else JOB_DESCRIPTION_TOKEN_BUDGET
+        )
+        
+        return _PROMPT_TPL.substitute(
+            resume_fields,
+            job_title=job_data.get('title', 'Position'),
+            company=job_data.get('company', 'Company'),
+            job_description=self._truncate_tokens(job_data.get('description', ''), budget),
+            tone=tone
+        )
+    
+    async def _create_completion(self, prompt: str, model: str = MODEL, stream: bool = False):
+        """
+        Call chat.completions.create under the rate-limit throttle
+        When OpenAI still returns 429, fall back to the next cheaper model tier,
+        or retry after a shared cool-down once already on the last tier
+        """
+        # Prompt size plus the completion budget
+        estimated_tokens = self._count_tokens(SYSTEM_PROMPT) + self._count_tokens(prompt) + MAX_TOKENS
+        
+        for attempt in range(MAX_ATTEMPTS):
+            await self._throttle.acquire(estimated_tokens)
+            try:
+                return await self.client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": SYSTEM_PROMPT
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.7,  # Balanced creativity
+                    max_tokens=MAX_TOKENS,
+                    stop=STOP_SEQUENCES,
+                    stream=stream
+                )
+            except RateLimitError:
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+                tier = MODEL_TIERS.index(model)
+                if tier + 1 < len(MODEL_TIERS):
+                    # Limits are per model, so the next tier can usually take the call right away
+                    model = MODEL_TIERS[tier + 1]
+                else:
+                    self._throttle.cool_down()
+    
+    async def generate_batch(
+        self,
+        resume_data: Dict,
+        jobs: List[Dict],
+        tone: str = "professional",
+        model_override: Optional[str] = None
+    ) -> List[Union[str, Exception]]:
+        """
+        Generate cover letters for several jobs concurrently
+        
+        Args:
+            resume_data: Dictionary with parsed resume data
+            jobs: List of job dictionaries
+            tone: Tone of the letters
+            model_override: Use this model for every letter instead of routing per job
+            
+        Returns:
+            One entry per job, in input order: the letter text, or the exception raised for that job
+        """
+        # Same resume for every job: render its part of the prompt once
+        resume_fields = self._resume_fields(resume_data)
+        return await asyncio.gather(
+            *(self._generate_letter(resume_fields, job_data, tone, model_override) for job_data in jobs),
+            return_exceptions=True
+        )
+    
+    @staticmethod
+    def _load_encoding(model: str):
+        """Tokenizer for the model, or None if tiktoken (or its encoding files) is unavailable"""
+        if tiktoken is None:
+            return None
+        try:
+            return tiktoken.encoding_for_model(model)
+        except Exception as e:
+            print(f"⚠️ tiktoken unavailable, estimating tokens from length: {e}")
+            return None
+    
+    def _count_tokens(self, text: str) -> int:
+        """Number of tokens in text"""
+        if self._enc is None:
+            return len(text) // 4 + 1
+        return len(self._enc.encode(text))
+    
+    def _truncate_tokens(self, text: str, budget: int) -> str:
+        """Cut text down to at most `budget` tokens"""
+        if self._enc is None:
+            return text[:budget * 4]
+        ids = self._enc.encode(text)
+        return text if len(ids) <= budget else self._enc.decode(ids[:budget])
+    
+    def _join_skills(self, skills: List[str], budget: int) -> str:
+        """Join as many skills (in order) as fit in `budget` tokens"""
+        kept = []
+        used = 0
+        for skill in skills:
+            # +1 for the ", " separator
+            cost = self._count_tokens(skill) + 1
+            if used + cost > budget:
+                break
+            kept.append(skill)
+            used += cost
+        return ', '.join(kept)
+    
+    @staticmethod
+    def _cache_key(model: str, system_message: str, prompt: str) -> str:
+        """Stable hash of everything sent to the model"""
+        payload = json.dumps({"m": model, "s": system_message, "p": prompt}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Return a cached letter if present and fresh (LRU order is refreshed)"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= COVER_LETTER_CACHE_TTL:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+    
+    def _cache_put(self, key: str, cover_letter: str) -> None:
+        """Store a letter, evicting the least recently used entries"""
+        self._cache[key] = (time.monotonic(), cover_letter)
+        self._cache.move_to_end(key)
+        while len(self._cache) > COVER_LETTER_CACHE_SIZE:
+            self._cache.popitem(last=False)
+    
     def _summarize_experience(self, experience_list: list) -> str:
         """Summarize experience for the prompt"""
-        if not experience_list or len(experience_list) == 0:
+        if not experience_list:
             return "Entry-level professional seeking first opportunity"
         
-        # Get most recent 2 positions
-        summaries = []
-        for exp in experience_list[:2]:
-            title = exp.get('title', '')
-            company = exp.get('company', '')
-            if title and company:
-                summaries.append(f"{title} at {company}")
-        
-        return "; ".join(summaries) if summaries else "Experienced professional"
+        # Most recent 2 positions
+        summary = "; ".join(
+            f"{exp['title']} at {exp['company']}"
+            for exp in experience_list[:2]
+            if exp.get('title') and exp.get('company')
+        )
+        return summary or "Experienced professional"
 
 
 # Test the generator
@@ -145,7 +476,9 @@ if __name__ == "__main__":
         }
         
         print("\n🔄 Generating cover letter... (this may take a few seconds)")
-        cover_letter = generator.generate_cover_letter(test_resume, test_job, tone="professional")
+        cover_letter = asyncio.run(
+            generator.generate_cover_letter(test_resume, test_job, tone="professional")
+        )
         
         print("\n✅ Cover Letter Generated Successfully!")
         print("\n" + "="*70)
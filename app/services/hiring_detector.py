@@ -3,78 +3,218 @@ Advanced Hiring Type Detector
 Analyzes job descriptions to determine if company is actively hiring vs building a talent pipeline
 Uses text analysis + structural metadata to detect resume harvesting
 """
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
 import re
+import threading
 from datetime import datetime, timedelta
+from types import MappingProxyType
+import numpy as np
+
+from app.services.text_patterns import trie_pattern
+
+
+# Patterns compiled once at import instead of on every call
+_REQ_ID_PATTERNS = [
+    re.compile(r'(?:req|requisition|job)\s*(?:id|#|number)?\s*:?\s*([A-Z0-9_-]+)', re.IGNORECASE),
+    re.compile(r'(?:reference|ref)\s*(?:number|#)?\s*:?\s*([A-Z0-9_-]+)', re.IGNORECASE),
+]
+
+_CITIES = (
+    'New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix', 'Philadelphia', 'San Antonio',
+    'San Diego', 'Dallas', 'San Jose', 'Austin', 'Jacksonville', 'Fort Worth', 'Columbus',
+    'Charlotte', 'San Francisco', 'Indianapolis', 'Seattle', 'Denver', 'Washington', 'Boston',
+    'El Paso', 'Nashville', 'Detroit', 'Oklahoma City', 'Portland', 'Las Vegas', 'Memphis',
+    'Louisville', 'Baltimore', 'Milwaukee', 'Albuquerque', 'Tucson', 'Fresno', 'Mesa',
+    'Sacramento', 'Atlanta', 'Kansas City', 'Colorado Springs', 'Omaha', 'Raleigh', 'Miami',
+    'Long Beach', 'Virginia Beach', 'Oakland', 'Minneapolis', 'Tulsa', 'Tampa', 'Arlington',
+    'New Orleans',
+)
+
+
+# City names are capitalized, so the lookahead rejects most positions in one check
+_CITIES_RE = re.compile(r'\b(?=[A-Z])' + trie_pattern(_CITIES) + r'\b')
+
+# All specificity signals in one scan of the already-lowercased posting.
+# The zero-width lookahead keeps one match from hiding another that overlaps it, and no two
+# groups can match at the same position, so each group fires exactly when its own pattern
+# would have matched on its own. The leading class is every group's first character.
+_SPECIFICITY_RE = re.compile(
+    r'(?=[rwpts$\d])(?='
+    r'(?P<manager>report(?:ing|s) to \w+)'
+    r'|(?P<project>working on|project|tech stack|tools we use)'
+    r'|(?P<compensation>\$[\d,]+|salary range|pay range|\d+k-\d+k)'
+    r')'
+)
+_SPECIFICITY_GROUPS = len(_SPECIFICITY_RE.groupindex)
+
+_DEPARTMENTS = ('engineering', 'marketing', 'sales', 'operations', 'product', 'design', 'data', 'finance')
+
+
+def _freeze(indicators: Dict[str, Iterable[str]]) -> Mapping[str, FrozenSet[str]]:
+    """Read-only category -> keyword frozenset mapping, safe to share across threads"""
+    return MappingProxyType({
+        category: frozenset(keywords) for category, keywords in indicators.items()
+    })
+
+
+# ACTIVE HIRING INDICATORS
+_ACTIVE_INDICATORS = _freeze({
+    'urgency': [
+        'urgent hiring', 'urgently hiring', 'immediate start', 
+        'immediate availability', 'asap', 'quick start',
+        'fast-paced hiring', 'rapid hiring', 'hiring immediately'
+    ],
+    'specificity': [
+        'reporting to', 'reporting directly to', 'join our team of',
+        'backfill', 'new team member', 'specific role',
+        'funded position', 'approved headcount', 'open position'
+    ],
+    'timeline': [
+        'start date', 'expected start', 'target start',
+        'hiring timeline', 'interview schedule', 'onboarding'
+    ],
+    'vacancy': [
+        'open role', 'vacancy', 'opening', 'position available',
+        'now hiring', 'accepting applications', 'apply now'
+    ]
+})
+
+# PASSIVE/PIPELINE INDICATORS
+_PASSIVE_INDICATORS = _freeze({
+    'evergreen': [
+        'ongoing need', 'continuous recruitment', 'always hiring',
+        'evergreen', 'rolling basis', 'continuous hiring',
+        'year-round recruitment'
+    ],
+    'pipeline': [
+        'future opportunities', 'talent pool', 'talent pipeline',
+        'talent community', 'career opportunities', 'join our database',
+        'future openings', 'potential opportunities'
+    ],
+    'general': [
+        'general interest', 'open application', 'speculative application',
+        'expression of interest', 'submit your resume',
+        'keep you in mind', 'future consideration'
+    ],
+    'vague': [
+        'various positions', 'multiple roles', 'several opportunities',
+        'range of positions', 'diverse opportunities'
+    ]
+})
+
+# RED FLAGS FOR RESUME HARVESTING
+_RED_FLAGS = _freeze({
+    'location_blast': [
+        'multiple locations', 'various locations', 'nationwide',
+        'all locations', 'remote - us', 'remote - global'
+    ],
+    'generic_contact': [
+        'email resume to', 'send resume to', 'forward cv to',
+        'jobs@', 'careers@', 'hr@', 'recruiting@'
+    ],
+    'vague_benefits': [
+        'competitive salary', 'competitive compensation',
+        'market rate', 'commensurate with experience',
+        'to be discussed', 'tbd', 'negotiable'
+    ],
+    'no_team_info': [
+        'growing company', 'dynamic team', 'talented team',
+        'innovative company'  # without specific department
+    ]
+})
+
+# Flattened keyword layout, built once at import:
+# _CATEGORY_SLOTS[i] is the (bucket, category) counted in slot i, and
+# _KEYWORD_INDEX pairs every keyword with its slot so a scan is one flat loop
+_BUCKETS = (
+    ('active', _ACTIVE_INDICATORS),
+    ('passive', _PASSIVE_INDICATORS),
+    ('red_flags', _RED_FLAGS),
+)
+_CATEGORY_SLOTS = tuple(
+    (bucket, category)
+    for bucket, indicators in _BUCKETS
+    for category in indicators
+)
+_KEYWORD_INDEX = tuple(
+    (keyword, slot)
+    for slot, keywords in enumerate(
+        keywords for _, indicators in _BUCKETS for keywords in indicators.values()
+    )
+    for keyword in keywords
+)
+# Keywords that occur inside longer keywords ('opening' in 'future openings'), mapped to
+# those longer keywords: longest match wins, so a hit only counts if it survives
+# masking them out and one phrase never scores as two signals
+_SHADOWED_BY = {
+    keyword: tuple(other for other, _ in _KEYWORD_INDEX if other != keyword and keyword in other)
+    for keyword, _ in _KEYWORD_INDEX
+    if any(other != keyword and keyword in other for other, _ in _KEYWORD_INDEX)
+}
+# Contiguous slot range of each bucket, for summing a row of counts per bucket
+_BUCKET_SLOTS = {
+    bucket: slice(
+        next(i for i, (b, _) in enumerate(_CATEGORY_SLOTS) if b == bucket),
+        1 + max(i for i, (b, _) in enumerate(_CATEGORY_SLOTS) if b == bucket)
+    )
+    for bucket, _ in _BUCKETS
+}
+_LOCATION_BLAST_SLOT = _CATEGORY_SLOTS.index(('red_flags', 'location_blast'))
+
+# Batches at least this large are split across worker processes (the scan is GIL-bound)
+PARALLEL_MIN_BATCH = 500
+BATCH_WORKERS = os.cpu_count() or 1
+_batch_pool: Optional[ProcessPoolExecutor] = None
+_batch_pool_lock = threading.Lock()
+
+
+def _get_batch_pool() -> ProcessPoolExecutor:
+    """Process pool for score_batch, started on first use and reused afterwards"""
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is None:
+            # spawn, not fork: the API process is multi-threaded
+            _batch_pool = ProcessPoolExecutor(
+                max_workers=BATCH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _batch_pool
+
+
+def _extract_chunk(args) -> Tuple[np.ndarray, np.ndarray]:
+    """Worker entry point; each process uses its own module-level detector"""
+    texts, posted_dates, now = args
+    return detector._extract_features(texts, posted_dates, now)
+
+
+def _final_scores(active, passive, red_flag, is_specific, req_suspicious, location_blast, is_stale):
+    """
+    Weighted (active, passive) totals from keyword counts and structural flags
+    Pure arithmetic, so it takes plain ints/bools for one posting or
+    equally-shaped numpy arrays for a whole batch
+    """
+    # Active signals (positive): text indicators, specificity, a real-looking req ID
+    final_active = active * 2 + 3 * is_specific + 2 * (1 - req_suspicious)
+    # Pipeline signals (negative for active hiring)
+    final_passive = (
+        passive * 2 + 3 * req_suspicious + 3 * location_blast + red_flag + 2 * is_stale
+    )
+    return final_active, final_passive
+
+
+ACTIVE_HIRING = "🟢 Active Hiring"
+PIPELINE = "🟡 Pipeline/Evergreen"
+MIXED_SIGNALS = "⚪ Mixed Signals"
 
 
 class HiringDetector:
-    def __init__(self):
-        # ACTIVE HIRING INDICATORS
-        self.active_indicators = {
-            'urgency': [
-                'urgent hiring', 'urgently hiring', 'immediate start', 
-                'immediate availability', 'asap', 'quick start',
-                'fast-paced hiring', 'rapid hiring', 'hiring immediately'
-            ],
-            'specificity': [
-                'reporting to', 'reporting directly to', 'join our team of',
-                'backfill', 'new team member', 'specific role',
-                'funded position', 'approved headcount', 'open position'
-            ],
-            'timeline': [
-                'start date', 'expected start', 'target start',
-                'hiring timeline', 'interview schedule', 'onboarding'
-            ],
-            'vacancy': [
-                'open role', 'vacancy', 'opening', 'position available',
-                'now hiring', 'accepting applications', 'apply now'
-            ]
-        }
-        
-        # PASSIVE/PIPELINE INDICATORS
-        self.passive_indicators = {
-            'evergreen': [
-                'ongoing need', 'continuous recruitment', 'always hiring',
-                'evergreen', 'rolling basis', 'continuous hiring',
-                'year-round recruitment'
-            ],
-            'pipeline': [
-                'future opportunities', 'talent pool', 'talent pipeline',
-                'talent community', 'career opportunities', 'join our database',
-                'future openings', 'potential opportunities'
-            ],
-            'general': [
-                'general interest', 'open application', 'speculative application',
-                'expression of interest', 'submit your resume',
-                'keep you in mind', 'future consideration'
-            ],
-            'vague': [
-                'various positions', 'multiple roles', 'several opportunities',
-                'range of positions', 'diverse opportunities'
-            ]
-        }
-        
-        # RED FLAGS FOR RESUME HARVESTING
-        self.red_flags = {
-            'location_blast': [
-                'multiple locations', 'various locations', 'nationwide',
-                'all locations', 'remote - us', 'remote - global'
-            ],
-            'generic_contact': [
-                'email resume to', 'send resume to', 'forward cv to',
-                'jobs@', 'careers@', 'hr@', 'recruiting@'
-            ],
-            'vague_benefits': [
-                'competitive salary', 'competitive compensation',
-                'market rate', 'commensurate with experience',
-                'to be discussed', 'tbd', 'negotiable'
-            ],
-            'no_team_info': [
-                'growing company', 'dynamic team', 'talented team',
-                'innovative company'  # without specific department
-            ]
-        }
+    # Immutable, shared by every instance; constructing a detector does no work
+    active_indicators = _ACTIVE_INDICATORS
+    passive_indicators = _PASSIVE_INDICATORS
+    red_flags = _RED_FLAGS
     
     def extract_requisition_id(self, text: str) -> Optional[str]:
         """
@@ -84,13 +224,8 @@ class HiringDetector:
         - REQ-2024-0452 (specific, likely real)
         - EVERGREEN_SALES (generic, likely pipeline)
         """
-        patterns = [
-            r'(?:req|requisition|job)\s*(?:id|#|number)?\s*:?\s*([A-Z0-9_-]+)',
-            r'(?:reference|ref)\s*(?:number|#)?\s*:?\s*([A-Z0-9_-]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _REQ_ID_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         
@@ -139,19 +274,22 @@ class HiringDetector:
             "reason": "Specific requisition ID suggests real opening"
         }
     
-    def detect_location_blast(self, text: str) -> Dict:
+    def detect_location_blast(self, text: str, location_count: Optional[int] = None) -> Dict:
         """
         Detect if job is posted in many locations (red flag)
+        
+        Args:
+            text: Job posting text
+            location_count: Multi-location keyword count, if already known from scan_keywords
         """
         # Count location mentions
-        location_count = 0
-        for keyword in self.red_flags['location_blast']:
-            if keyword in text.lower():
-                location_count += 1
+        if location_count is None:
+            location_count = self.count_indicators(
+                text, {'location_blast': self.red_flags['location_blast']}
+            )['location_blast']
         
         # Look for multiple city names
-        cities_pattern = r'\b(?:New York|Los Angeles|Chicago|Houston|Phoenix|Philadelphia|San Antonio|San Diego|Dallas|San Jose|Austin|Jacksonville|Fort Worth|Columbus|Charlotte|San Francisco|Indianapolis|Seattle|Denver|Washington|Boston|El Paso|Nashville|Detroit|Oklahoma City|Portland|Las Vegas|Memphis|Louisville|Baltimore|Milwaukee|Albuquerque|Tucson|Fresno|Mesa|Sacramento|Atlanta|Kansas City|Colorado Springs|Omaha|Raleigh|Miami|Long Beach|Virginia Beach|Oakland|Minneapolis|Tulsa|Tampa|Arlington|New Orleans)\b'
-        cities_found = len(re.findall(cities_pattern, text))
+        cities_found = len(_CITIES_RE.findall(text))
         
         is_blast = location_count > 0 or cities_found >= 5
         
@@ -162,33 +300,45 @@ class HiringDetector:
             "reason": f"Found {cities_found} cities and {location_count} multi-location keywords" if is_blast else "Normal location specificity"
         }
     
-    def analyze_specificity(self, text: str) -> Dict:
+    def analyze_specificity(self, text: str, text_lower: Optional[str] = None) -> Dict:
         """
         Analyze how specific the job description is
         Vague = pipeline, Specific = real role
+        
+        Args:
+            text: Job posting text
+            text_lower: text.lower(), if the caller already has it
         """
+        if text_lower is None:
+            text_lower = text.lower()
+        
+        signals = set()
+        for match in _SPECIFICITY_RE.finditer(text_lower):
+            signals.add(match.lastgroup)
+            if len(signals) == _SPECIFICITY_GROUPS:
+                break
+        
         specificity_score = 0
         details_found = []
         
         # Check for specific manager/team mentions
-        if re.search(r'reporting to \w+|reports to \w+', text, re.IGNORECASE):
+        if 'manager' in signals:
             specificity_score += 2
             details_found.append("Specific manager mentioned")
         
         # Check for department/team specificity
-        departments = ['engineering', 'marketing', 'sales', 'operations', 'product', 'design', 'data', 'finance']
-        dept_mentions = sum(1 for dept in departments if dept in text.lower())
+        dept_mentions = sum(1 for dept in _DEPARTMENTS if dept in text_lower)
         if dept_mentions >= 2:
             specificity_score += 1
             details_found.append(f"{dept_mentions} specific departments")
         
         # Check for project/tech stack details
-        if re.search(r'working on|project|tech stack|tools we use', text, re.IGNORECASE):
+        if 'project' in signals:
             specificity_score += 1
             details_found.append("Project/tech details mentioned")
         
         # Check for compensation transparency
-        if re.search(r'\$[\d,]+|salary range|pay range|\d+k-\d+k', text, re.IGNORECASE):
+        if 'compensation' in signals:
             specificity_score += 2
             details_found.append("Specific compensation mentioned")
         
@@ -210,21 +360,191 @@ class HiringDetector:
         
         return matches
     
-    def analyze_hiring_type(self, job_description: str, posted_date: Optional[str] = None) -> Dict:
+    def scan_keywords(self, text: str, text_lower: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Count indicator matches for every bucket in a single pass over the keywords
+        
+        Args:
+            text: Job posting text
+            text_lower: text.lower(), if the caller already has it
+            
+        Returns:
+            {'active': {...}, 'passive': {...}, 'red_flags': {...}} category counts
+        """
+        if text_lower is None:
+            text_lower = text.lower()
+        
+        matches = {bucket: {} for bucket, _ in _BUCKETS}
+        for (bucket, category), count in zip(_CATEGORY_SLOTS, self._scan_counts(text_lower)):
+            matches[bucket][category] = count
+        
+        return matches
+    
+    @staticmethod
+    def _scan_counts(text_lower: str) -> List[int]:
+        """Per-slot keyword counts (see _CATEGORY_SLOTS) for already-lowercased text"""
+        counts = [0] * len(_CATEGORY_SLOTS)
+        for keyword, slot in _KEYWORD_INDEX:
+            if keyword in text_lower:
+                longer = _SHADOWED_BY.get(keyword)
+                if longer:
+                    masked = text_lower
+                    for other in longer:
+                        masked = masked.replace(other, '\0')
+                    if keyword not in masked:
+                        continue
+                counts[slot] += 1
+        return counts
+    
+    @staticmethod
+    def _parse_iso(value: str) -> datetime:
+        """Parse an ISO date/datetime, accepting a trailing 'Z' for UTC"""
+        if value.endswith('Z'):
+            return datetime.fromisoformat(value[:-1] + '+00:00')
+        return datetime.fromisoformat(value)
+    
+    def _posting_age_days(
+        self,
+        posted_date: Optional[Union[str, datetime]],
+        now: Optional[datetime]
+    ) -> Optional[int]:
+        """Days since posting, or None if no (valid) date was given"""
+        if not posted_date:
+            return None
+        try:
+            post_date = posted_date if isinstance(posted_date, datetime) else self._parse_iso(posted_date)
+            return ((now or datetime.now()) - post_date.replace(tzinfo=None)).days
+        except (ValueError, TypeError):
+            return None
+    
+    def _extract_features(
+        self,
+        job_descriptions: List[str],
+        posted_dates: List[Optional[str]],
+        now: datetime
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-posting inputs to the weighting step
+        
+        Returns:
+            (counts, flags): int32 keyword counts per slot, and booleans
+            [is_specific, req_suspicious, location_blast, is_stale] per posting
+        """
+        n = len(job_descriptions)
+        counts = np.zeros((n, len(_CATEGORY_SLOTS)), dtype=np.int32)
+        flags = np.zeros((n, 4), dtype=bool)
+        
+        for i, (text, posted_date) in enumerate(zip(job_descriptions, posted_dates)):
+            text_lower = text.lower()
+            row = self._scan_counts(text_lower)
+            counts[i] = row
+            age = self._posting_age_days(posted_date, now)
+            flags[i] = (
+                self.analyze_specificity(text, text_lower)['is_specific'],
+                self.analyze_req_id(self.extract_requisition_id(text))['is_suspicious'],
+                self.detect_location_blast(text, location_count=row[_LOCATION_BLAST_SLOT])['is_location_blast'],
+                age is not None and age > 45
+            )
+        
+        return counts, flags
+    
+    def score_batch(
+        self,
+        job_descriptions: List[str],
+        posted_dates: Optional[List[Optional[str]]] = None,
+        now: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Score many postings at once (scores and hiring type only, no insights/strategy)
+        Large batches are spread over a process pool
+        
+        Args:
+            job_descriptions: Job posting texts
+            posted_dates: Optional posting dates, aligned with job_descriptions
+            now: Reference time for posting age (defaults to one datetime.now() for the batch)
+            
+        Returns:
+            One dict per posting with hiring_type, confidence, active_score,
+            passive_score and red_flag_score (same values analyze_hiring_type gives)
+        """
+        n = len(job_descriptions)
+        if posted_dates is None:
+            posted_dates = [None] * n
+        now = now or datetime.now()
+        
+        if n >= PARALLEL_MIN_BATCH and BATCH_WORKERS > 1:
+            # One contiguous chunk per worker keeps pickling to a few large messages
+            size = -(-n // BATCH_WORKERS)
+            chunks = [
+                (job_descriptions[i:i + size], posted_dates[i:i + size], now)
+                for i in range(0, n, size)
+            ]
+            parts = list(_get_batch_pool().map(_extract_chunk, chunks))
+            counts = np.concatenate([part[0] for part in parts])
+            flags = np.concatenate([part[1] for part in parts])
+        else:
+            counts, flags = self._extract_features(job_descriptions, posted_dates, now)
+        
+        is_specific, req_suspicious, location_blast, is_stale = flags.T
+        
+        # Weighting, vectorized over the whole batch
+        active = counts[:, _BUCKET_SLOTS['active']].sum(axis=1)
+        passive = counts[:, _BUCKET_SLOTS['passive']].sum(axis=1)
+        red_flag = counts[:, _BUCKET_SLOTS['red_flags']].sum(axis=1)
+        
+        final_active, final_passive = _final_scores(
+            active, passive, red_flag, is_specific, req_suspicious, location_blast, is_stale
+        )
+        
+        is_active = final_active > final_passive * 1.5
+        is_pipeline = ~is_active & (final_passive > final_active * 1.5)
+        hiring_types = np.select([is_active, is_pipeline], [ACTIVE_HIRING, PIPELINE], MIXED_SIGNALS)
+        confidences = np.select(
+            [is_active & (final_active >= 8), is_active,
+             is_pipeline & (final_passive >= 8), is_pipeline],
+            ["High", "Medium", "High", "Medium"],
+            "Low"
+        )
+        
+        return [
+            {
+                "hiring_type": hiring_type,
+                "confidence": confidence,
+                "active_score": a,
+                "passive_score": p,
+                "red_flag_score": r
+            }
+            for hiring_type, confidence, a, p, r in zip(
+                hiring_types.tolist(), confidences.tolist(),
+                final_active.tolist(), final_passive.tolist(), red_flag.tolist()
+            )
+        ]
+    
+    def analyze_hiring_type(
+        self,
+        job_description: str,
+        posted_date: Optional[Union[str, datetime]] = None,
+        now: Optional[datetime] = None
+    ) -> Dict:
         """
         Comprehensive hiring type analysis
         
         Args:
             job_description: Full job posting text
-            posted_date: Optional posting date (ISO format: YYYY-MM-DD)
+            posted_date: Optional posting date (ISO format: YYYY-MM-DD, or a datetime)
+            now: Reference time for posting age; batch callers pass one value for every posting
             
         Returns:
             Complete analysis with hiring type, confidence, and insights
         """
+        # Lowercase once; every keyword and specificity check reuses it
+        text_lower = job_description.lower()
+        
         # 1. Text-based analysis
-        active_matches = self.count_indicators(job_description, self.active_indicators)
-        passive_matches = self.count_indicators(job_description, self.passive_indicators)
-        red_flag_matches = self.count_indicators(job_description, self.red_flags)
+        matches = self.scan_keywords(job_description, text_lower)
+        active_matches = matches['active']
+        passive_matches = matches['passive']
+        red_flag_matches = matches['red_flags']
         
         active_score = sum(active_matches.values())
         passive_score = sum(passive_matches.values())
@@ -234,42 +554,27 @@ class HiringDetector:
         req_id_analysis = self.analyze_req_id(
             self.extract_requisition_id(job_description)
         )
-        location_analysis = self.detect_location_blast(job_description)
-        specificity_analysis = self.analyze_specificity(job_description)
+        location_analysis = self.detect_location_blast(
+            job_description, location_count=red_flag_matches['location_blast']
+        )
+        specificity_analysis = self.analyze_specificity(job_description, text_lower)
         
         # 3. Posting age analysis (if date provided)
-        posting_age_days = None
-        is_stale = False
-        if posted_date:
-            try:
-                post_date = datetime.fromisoformat(posted_date.replace('Z', '+00:00'))
-                age = datetime.now() - post_date.replace(tzinfo=None)
-                posting_age_days = age.days
-                is_stale = posting_age_days > 45
-            except:
-                pass
+        posting_age_days = self._posting_age_days(posted_date, now)
+        is_stale = posting_age_days is not None and posting_age_days > 45
         
         # 4. Calculate weighted final score
-        # Active signals (positive)
-        final_active_score = active_score * 2  # Text indicators
-        if specificity_analysis['is_specific']:
-            final_active_score += 3
-        if not req_id_analysis['is_suspicious']:
-            final_active_score += 2
-        
-        # Pipeline signals (negative for active hiring)
-        final_passive_score = passive_score * 2
-        if req_id_analysis['is_suspicious']:
-            final_passive_score += 3
-        if location_analysis['is_location_blast']:
-            final_passive_score += 3
-        final_passive_score += red_flag_score
-        if is_stale:
-            final_passive_score += 2
+        final_active_score, final_passive_score = _final_scores(
+            active_score, passive_score, red_flag_score,
+            specificity_analysis['is_specific'],
+            req_id_analysis['is_suspicious'],
+            location_analysis['is_location_blast'],
+            is_stale
+        )
         
         # 5. Determine hiring type
         if final_active_score > final_passive_score * 1.5:
-            hiring_type = "🟢 Active Hiring"
+            hiring_type = ACTIVE_HIRING
             confidence = "High" if final_active_score >= 8 else "Medium"
             explanation = (
                 "This is a real, funded position with an immediate hiring need. "
@@ -277,7 +582,7 @@ class HiringDetector:
                 "specific vacancy to fill. Expect a structured process with faster response times."
             )
         elif final_passive_score > final_active_score * 1.5:
-            hiring_type = "🟡 Pipeline/Evergreen"
+            hiring_type = PIPELINE
             confidence = "High" if final_passive_score >= 8 else "Medium"
             explanation = (
                 "This appears to be a talent pipeline or 'evergreen' requisition. "
@@ -285,7 +590,7 @@ class HiringDetector:
                 "filling an immediate vacancy. Response times may be slow or nonexistent."
             )
         else:
-            hiring_type = "⚪ Mixed Signals"
+            hiring_type = MIXED_SIGNALS
             confidence = "Low"
             explanation = (
                 "This posting shows conflicting indicators. It may be a legitimate role "
@@ -327,7 +632,7 @@ class HiringDetector:
             insights.append(f"🚩 Posting is {posting_age_days} days old (likely stale)")
         
         # 7. Application strategy
-        if hiring_type == "🟢 Active Hiring":
+        if hiring_type == ACTIVE_HIRING:
             strategy = [
                 "✅ Apply quickly - this is a time-sensitive opportunity",
                 "📝 Tailor resume to exact requirements in posting",
@@ -335,7 +640,7 @@ class HiringDetector:
                 "👥 Competition is high - differentiate yourself clearly",
                 "📞 Follow up within 1 week if no response"
             ]
-        elif hiring_type == "🟡 Pipeline/Evergreen":
+        elif hiring_type == PIPELINE:
             strategy = [
                 "⏳ Set expectations for slow/no response",
                 "🤝 Try to network with employees instead of just applying",
@@ -379,9 +684,12 @@ class HiringDetector:
         }
 
 
+# Stateless, so one instance serves the whole process
+detector = HiringDetector()
+
+
 # Test the detector
 if __name__ == "__main__":
-    detector = HiringDetector()
     
     print("=" * 80)
     print("🧪 TESTING ADVANCED HIRING TYPE DETECTOR")
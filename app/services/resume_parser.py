@@ -3,8 +3,52 @@ Resume Parser Service
 Extracts text and structured data from PDF resumes
 """
 import PyPDF2
+import hashlib
+import io
+import itertools
+import multiprocessing
+import os
 import re
-from typing import Dict, List, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, List, Optional
+
+from app.services.text_patterns import trie_pattern
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # Fall back to the slower pure-Python PyPDF2 reader
+    pdfium = None
+
+# PDFium is not thread-safe, and uploads are parsed in worker threads
+_PDFIUM_LOCK = threading.Lock()
+
+# Worker processes for parsing uploads (0 = parse on the API process's threadpool).
+# Text extraction and the scans hold the GIL, so threads alone don't scale across cores
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "0"))
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+# Patterns compiled once at import instead of on every call
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+# Matches formats: (123) 456-7890, 123-456-7890, 123.456.7890, +1-123-456-7890
+_PHONE_RE = re.compile(r'(\+\d{1,3}[-.\s]??)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+# Common degree patterns (bachelor's/master's/doctorate, then associate), one scan in document order
+_DEGREE_RE = re.compile(
+    r"(Bachelor'?s?|B\.?S\.?|B\.?A\.?|Master'?s?|M\.?S\.?|M\.?A\.?|Ph\.?D\.?|MBA"
+    r"|Associate'?s?|A\.?S\.?|A\.?A\.?)",
+    re.IGNORECASE
+)
+MAX_EDUCATION_ENTRIES = 3
+EDUCATION_CONTEXT_CHARS = 50  # Characters of context kept on each side of a degree
+
+# Analysis is deterministic per text, so re-uploads of the same resume reuse a recent result
+PARSE_CACHE_SIZE = 256
+# Common experience keywords looked for by the ATS score
+_EXPERIENCE_KEYWORDS = ('experience', 'worked', 'developed', 'managed', 'led', 'designed')
+EXPERIENCE_TOP_TIER = 4  # Keyword count earning the full 30 points
 
 
 class ResumeParser:
@@ -19,6 +63,19 @@ class ResumeParser:
             'machine learning', 'deep learning', 'nlp', 'computer vision', 'data science',
             'rest api', 'graphql', 'microservices', 'agile', 'scrum', 'git', 'ci/cd'
         ]
+        
+        # One trie-shaped pattern for every skill, scanned once per resume. The match sits in
+        # a lookahead so it consumes nothing: a skill starting inside another skill's match is
+        # still found, exactly as if each skill were searched for on its own
+        self._skills_re = re.compile(
+            r'\b(?=(' + trie_pattern(skill.lower() for skill in self.tech_skills) + r')\b)'
+        )
+        # Matched (lowercase) skill -> display name, capitalized once
+        self._skill_names = {skill.lower(): skill.title() for skill in self.tech_skills}
+        
+        # BLAKE2 digest of raw text -> analyze_text result, least recently used first
+        self._parse_cache: "OrderedDict[bytes, Dict]" = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
     
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """
@@ -27,54 +84,81 @@ class ResumeParser:
         Args:
             pdf_path: Path to the PDF file
             
+        Returns:
+            Extracted text as string
+        """
+        with open(pdf_path, 'rb') as file:
+            return self.extract_text_from_stream(file)
+    
+    def extract_text_from_stream(self, stream: BinaryIO) -> str:
+        """
+        Extract raw text from an open binary PDF stream
+        
+        Args:
+            stream: Seekable binary file-like object containing the PDF
+            
         Returns:
             Extracted text as string
         """
         try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-            return text.strip()
+            if pdfium is not None:
+                return self._extract_text_pdfium(stream)
+            
+            reader = PyPDF2.PdfReader(stream)
+            # Join once instead of re-copying the accumulated text per page;
+            # image-only pages can come back as None
+            return "\n".join(page.extract_text() or "" for page in reader.pages).strip()
         except Exception as e:
             raise Exception(f"Error reading PDF: {str(e)}")
     
+    @staticmethod
+    def _extract_text_pdfium(stream: BinaryIO) -> str:
+        """Extract text with PDFium (C++), closing every page and the document when done"""
+        parts = []
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(stream)
+            try:
+                for index in range(len(pdf)):
+                    page = pdf[index]
+                    textpage = page.get_textpage()
+                    try:
+                        parts.append(textpage.get_text_range())
+                    finally:
+                        textpage.close()
+                        page.close()
+            finally:
+                pdf.close()
+        
+        # PDFium separates lines with \r\n
+        return "\n".join(parts).replace("\r\n", "\n").strip()
+    
     def extract_email(self, text: str) -> Optional[str]:
         """Extract email address from text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, text)
+        match = _EMAIL_RE.search(text)
         return match.group(0) if match else None
     
     def extract_phone(self, text: str) -> Optional[str]:
         """Extract phone number from text"""
-        # Matches formats: (123) 456-7890, 123-456-7890, 123.456.7890, +1-123-456-7890
-        phone_pattern = r'(\+\d{1,3}[-.\s]??)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        match = re.search(phone_pattern, text)
+        match = _PHONE_RE.search(text)
         return match.group(0) if match else None
     
-    def extract_skills(self, text: str) -> List[str]:
+    def extract_skills(self, text: str, text_lower: Optional[str] = None) -> List[str]:
         """
         Extract technical skills from resume text
         
         Args:
             text: Resume text
+            text_lower: text.lower(), if the caller already has it
             
         Returns:
             List of found skills
         """
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in self.tech_skills:
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                # Capitalize properly for display
-                found_skills.append(skill.title())
+        if text_lower is None:
+            text_lower = text.lower()
         
-        # Remove duplicates and sort
-        return sorted(list(set(found_skills)))
+        # findall returns the captured skill strings without building match objects;
+        # the display names go straight into one set, sorted once at the end
+        return sorted({self._skill_names[skill] for skill in self._skills_re.findall(text_lower)})
     
     def extract_education(self, text: str) -> List[Dict[str, str]]:
         """
@@ -85,28 +169,18 @@ class ResumeParser:
         """
         education = []
         
-        # Common degree patterns
-        degree_patterns = [
-            r"(Bachelor'?s?|B\.?S\.?|B\.?A\.?|Master'?s?|M\.?S\.?|M\.?A\.?|Ph\.?D\.?|MBA)",
-            r"(Associate'?s?|A\.?S\.?|A\.?A\.?)"
-        ]
+        # Stop scanning once the last entry we return has been found
+        for match in itertools.islice(_DEGREE_RE.finditer(text), MAX_EDUCATION_ENTRIES):
+            # Surrounding context; slicing already clamps the end to len(text)
+            start = max(0, match.start() - EDUCATION_CONTEXT_CHARS)
+            education.append({
+                "degree": match.group(0),
+                "context": text[start:match.end() + EDUCATION_CONTEXT_CHARS].strip()
+            })
         
-        for pattern in degree_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Extract surrounding context (50 chars before and after)
-                start = max(0, match.start() - 50)
-                end = min(len(text), match.end() + 50)
-                context = text[start:end].strip()
-                
-                education.append({
-                    "degree": match.group(0),
-                    "context": context
-                })
-        
-        return education[:3]  # Return max 3 education entries
+        return education
     
-    def calculate_ats_score(self, parsed_data: Dict) -> float:
+    def calculate_ats_score(self, parsed_data: Dict, text_lower: Optional[str] = None) -> float:
         """
         Calculate ATS compatibility score (0-100)
         
@@ -118,6 +192,7 @@ class ResumeParser:
         
         Args:
             parsed_data: Dictionary with parsed resume data
+            text_lower: raw_text.lower(), if the caller already has it
             
         Returns:
             Score between 0 and 100
@@ -146,11 +221,17 @@ class ResumeParser:
         
         # Experience indicators (30 points)
         # Look for common experience keywords in text
-        text_lower = parsed_data.get('raw_text', '').lower()
-        experience_keywords = ['experience', 'worked', 'developed', 'managed', 'led', 'designed']
-        found_keywords = sum(1 for keyword in experience_keywords if keyword in text_lower)
+        if text_lower is None:
+            text_lower = parsed_data.get('raw_text', '').lower()
+        found_keywords = 0
+        for keyword in _EXPERIENCE_KEYWORDS:
+            if keyword in text_lower:
+                found_keywords += 1
+                # More matches can't raise the score past the top tier
+                if found_keywords >= EXPERIENCE_TOP_TIER:
+                    break
         
-        if found_keywords >= 4:
+        if found_keywords >= EXPERIENCE_TOP_TIER:
             score += 30
         elif found_keywords >= 2:
             score += 20
@@ -159,13 +240,19 @@ class ResumeParser:
         
         return min(score, 100.0)  # Cap at 100
     
-    def generate_suggestions(self, parsed_data: Dict, ats_score: float) -> List[str]:
+    def generate_suggestions(
+        self,
+        parsed_data: Dict,
+        ats_score: float,
+        text_lower: Optional[str] = None
+    ) -> List[str]:
         """
         Generate improvement suggestions based on parsed data
         
         Args:
             parsed_data: Parsed resume data
             ats_score: Calculated ATS score
+            text_lower: raw_text.lower(), if the caller already has it
             
         Returns:
             List of suggestion strings
@@ -186,8 +273,9 @@ class ResumeParser:
             if len(parsed_data.get('education', [])) == 0:
                 suggestions.append("📚 Include your education background")
             
-            text = parsed_data.get('raw_text', '').lower()
-            if 'experience' not in text and 'worked' not in text:
+            if text_lower is None:
+                text_lower = parsed_data.get('raw_text', '').lower()
+            if 'experience' not in text_lower and 'worked' not in text_lower:
                 suggestions.append("💼 Add work experience with action verbs (developed, led, managed)")
         
         if ats_score >= 70 and ats_score < 85:
@@ -209,13 +297,44 @@ class ResumeParser:
         Returns:
             Dictionary with parsed data and analysis
         """
-        # Extract text
-        raw_text = self.extract_text_from_pdf(pdf_path)
+        return self.analyze_text(self.extract_text_from_pdf(pdf_path))
+    
+    def parse_resume_bytes(self, data: bytes) -> Dict:
+        """
+        Parse a resume held in memory (e.g. an upload) without touching disk
+        
+        Args:
+            data: Raw PDF bytes
+            
+        Returns:
+            Dictionary with parsed data and analysis
+        """
+        return self.analyze_text(self.extract_text_from_stream(io.BytesIO(data)))
+    
+    def analyze_text(self, raw_text: str) -> Dict:
+        """
+        Extract structured data, ATS score, and suggestions from resume text
+        
+        Args:
+            raw_text: Text extracted from the resume
+            
+        Returns:
+            Dictionary with parsed data and analysis
+        """
+        key = hashlib.blake2b(raw_text.encode("utf-8"), digest_size=16).digest()
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(key)
+            if cached is not None:
+                self._parse_cache.move_to_end(key)
+                return cached
+        
+        # Lowercased once for the skill scan, the score, and the suggestions
+        text_lower = raw_text.lower()
         
         # Extract components
         email = self.extract_email(raw_text)
         phone = self.extract_phone(raw_text)
-        skills = self.extract_skills(raw_text)
+        skills = self.extract_skills(raw_text, text_lower)
         education = self.extract_education(raw_text)
         
         # Build structured data
@@ -229,18 +348,52 @@ class ResumeParser:
         }
         
         # Calculate ATS score
-        ats_score = self.calculate_ats_score(parsed_data)
+        ats_score = self.calculate_ats_score(parsed_data, text_lower)
         
         # Generate suggestions
-        suggestions = self.generate_suggestions(parsed_data, ats_score)
+        suggestions = self.generate_suggestions(parsed_data, ats_score, text_lower)
         
-        return {
+        result = {
             "parsed_data": parsed_data,
             "ats_score": ats_score,
             "suggestions": suggestions,
             "status": "success"
         }
+        
+        with self._parse_cache_lock:
+            self._parse_cache[key] = result
+            self._parse_cache.move_to_end(key)
+            while len(self._parse_cache) > PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        
+        return result
+
+
+
+def get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """Process pool for parsing uploads, started on first use; None when PARSE_WORKERS is 0"""
+    global _parse_pool
+    if PARSE_WORKERS <= 0:
+        return None
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # spawn, not fork: the API process is multi-threaded
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _parse_pool
+
+
+_worker_parser: Optional["ResumeParser"] = None
+
 
+def parse_resume_bytes_in_worker(data: bytes) -> Dict:
+    """Worker entry point; each process builds its own parser (and parse cache) once"""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = ResumeParser()
+    return _worker_parser.parse_resume_bytes(data)
 
 # Test the parser
 if __name__ == "__main__":
@@ -4,61 +4,274 @@ Uses ML embeddings to find semantic similarity between resumes and jobs
 """
 from sentence_transformers import SentenceTransformer
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import heapq
 import os
+import sqlite3
+import threading
+
+
+# Bump when the stored vectors change meaning (v2: L2-normalized at encode time)
+EMBEDDING_CACHE_VERSION = "v2"
+
+# Inference backend: "torch" (default), or "onnx"/"openvino" for faster CPU inference
+# (needs sentence-transformers>=3.2 with optimum[onnxruntime] / optimum[openvino])
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+
+# Cached embeddings are stored as int8 with one float scale per vector (4x smaller than
+# float32, scores move by well under 1 point); scoring dequantizes to float32
+EMBEDDING_CACHE_DTYPE = np.int8
+_INT8_MAX = np.iinfo(EMBEDDING_CACHE_DTYPE).max
+
+# (minimum score, color, label) from best to worst; anything below the last threshold is a weak match
+MATCH_LEVELS = (
+    (80, "🟢", "Excellent Match"),
+    (65, "🟡", "Good Match"),
+    (50, "🟠", "Fair Match"),
+)
+WEAK_MATCH = ("🔴", "Weak Match")
+# Display strings for ranked results, built once
+_RANKED_LEVELS = tuple((threshold, f"{color} {label}") for threshold, color, label in MATCH_LEVELS)
+_RANKED_WEAK = f"{WEAK_MATCH[0]} {WEAK_MATCH[1]}"
+
+# SQLite file that keeps embeddings across restarts (empty disables it)
+EMBEDDING_DISK_CACHE_PATH = os.getenv("EMBEDDING_DISK_CACHE_PATH", "embedding_cache.db")
+# Keys per SELECT ... IN (...) query, below SQLite's bound-parameter limit
+_DISK_LOOKUP_CHUNK = 500
+
+
+class _EmbeddingStore:
+    """Quantized embeddings in a SQLite table, shared by worker threads and processes"""
+    
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, scale REAL NOT NULL)"
+        )
+        self._conn.commit()
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[np.ndarray, np.float32]]:
+        """Stored (quantized vector, scale) for each of keys that is on disk"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        try:
+            with self._lock:
+                for start in range(0, len(keys), _DISK_LOOKUP_CHUNK):
+                    chunk = keys[start:start + _DISK_LOOKUP_CHUNK]
+                    rows = self._conn.execute(
+                        f"SELECT key, vector, scale FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    for key, vector, scale in rows:
+                        found[key] = (np.frombuffer(vector, dtype=EMBEDDING_CACHE_DTYPE), np.float32(scale))
+        except sqlite3.Error as e:
+            print(f"⚠️ Embedding disk cache read failed: {e}")
+        return found
+    
+    def put_many(self, entries: Dict[str, Tuple[np.ndarray, np.float32]]) -> None:
+        """Store (quantized vector, scale) entries in one transaction"""
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, scale) VALUES (?, ?, ?)",
+                    [(key, quantized.tobytes(), float(scale)) for key, (quantized, scale) in entries.items()]
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Embedding disk cache write failed: {e}")
 
 
 class SemanticMatcher:
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", cache_size: int = 4096):
         """
         Initialize the semantic matcher with a pre-trained model
         
         Args:
             model_name: Hugging Face model name (all-MiniLM-L6-v2 is fast and good)
+            cache_size: Max number of embeddings kept in the in-process cache
         """
-        print(f"🔄 Loading embedding model: {model_name}...")
-        self.model = SentenceTransformer(model_name)
+        print(f"🔄 Loading embedding model: {model_name} ({EMBEDDING_BACKEND})...")
+        self.model = self._load_model(model_name, EMBEDDING_BACKEND)
         print(f"✅ Model loaded successfully!")
         
-        # Cache for embeddings (in production, use Redis or database)
-        self.embedding_cache = {}
+        # Content-addressed LRU cache for embeddings (in production, use Redis or database).
+        # Vectors live in one preallocated (cache_size, dim) block; embedding_cache maps
+        # each key to its row, and an evicted entry's row is reused by the next insert
+        self.cache_size = cache_size
+        self.embedding_cache = OrderedDict()
+        self._cache_vectors: Optional[np.ndarray] = None  # Allocated once the dimension is known
+        self._cache_scales = np.zeros(cache_size, dtype=np.float32)
+        # The matcher is shared across threadpool requests; guards the index and the block together
+        self._cache_lock = threading.Lock()
+        
+        # Second tier behind the in-process cache, so restarts don't re-encode known texts
+        self._disk = self._open_disk_cache(EMBEDDING_DISK_CACHE_PATH)
     
-    def get_embedding(self, text: str, cache_key: str = None) -> np.ndarray:
+    @staticmethod
+    def _load_model(model_name: str, backend: str) -> SentenceTransformer:
+        """Load the model on the requested backend, falling back to PyTorch if it is unavailable"""
+        if backend != "torch":
+            try:
+                # Exports the model to ONNX/OpenVINO on first load if no exported file exists
+                return SentenceTransformer(model_name, backend=backend)
+            except Exception as e:
+                print(f"⚠️ {backend} backend unavailable, using PyTorch: {e}")
+        
+        model = SentenceTransformer(model_name)
+        if model.device.type == "cuda":
+            model.half()
+        return model
+    
+    @staticmethod
+    def _open_disk_cache(path: str) -> Optional[_EmbeddingStore]:
+        """Open the persistent embedding cache, or None if disabled or unusable"""
+        if not path:
+            return None
+        try:
+            return _EmbeddingStore(path)
+        except sqlite3.Error as e:
+            print(f"⚠️ Embedding disk cache unavailable, using memory only: {e}")
+            return None
+    
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        """Build a content-addressed cache key for a text"""
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        return f"emb:{EMBEDDING_CACHE_VERSION}:{digest}"
+    
+    def _cache_row(self, key: str) -> Optional[int]:
+        """Row holding a cached embedding, marking it as recently used (call with _cache_lock held)"""
+        row = self.embedding_cache.get(key)
+        if row is None:
+            return None
+        self.embedding_cache.move_to_end(key)
+        return row
+    
+    def _cache_read(self, rows) -> np.ndarray:
+        """Dequantize one row (int) or several rows (list) of the cache block to float32 (call with _cache_lock held)"""
+        return self._cache_vectors[rows].astype(np.float32) * self._cache_scales[rows, None]
+    
+    @staticmethod
+    def _quantize(embedding: np.ndarray) -> Tuple[np.ndarray, np.float32]:
+        """int8 vector and scale for an embedding"""
+        # Symmetric per-vector scale so the largest component maps to +/-127
+        scale = np.float32(np.abs(embedding).max() / _INT8_MAX) or np.float32(1.0)
+        return np.round(embedding / scale).astype(EMBEDDING_CACHE_DTYPE), scale
+    
+    def _cache_put(self, key: str, quantized: np.ndarray, scale: np.float32) -> None:
+        """Store a quantized embedding, evicting the least recently used entry when full"""
+        with self._cache_lock:
+            if self._cache_vectors is None:
+                self._cache_vectors = np.zeros((self.cache_size, quantized.shape[-1]), dtype=EMBEDDING_CACHE_DTYPE)
+            
+            row = self.embedding_cache.get(key)
+            if row is None:
+                if len(self.embedding_cache) < self.cache_size:
+                    row = len(self.embedding_cache)
+                else:
+                    _, row = self.embedding_cache.popitem(last=False)
+                self.embedding_cache[key] = row
+            self.embedding_cache.move_to_end(key)
+            
+            self._cache_vectors[row] = quantized
+            self._cache_scales[row] = scale
+    
+    def get_embedding(self, text: str) -> np.ndarray:
         """
-        Get embedding for text (with optional caching)
+        Get embedding for text (cached by content hash)
         
         Args:
             text: Text to embed
-            cache_key: Optional key for caching
             
         Returns:
-            Embedding vector
+            L2-normalized embedding vector
+        """
+        return self.get_embeddings([text])[0]
+    
+    def get_embeddings(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Get embeddings for many texts using a single batched encode call
+        
+        Args:
+            texts: Texts to embed
+            batch_size: Batch size passed to the model
+            
+        Returns:
+            L2-normalized embedding matrix of shape (len(texts), dim)
         """
-        if cache_key and cache_key in self.embedding_cache:
-            return self.embedding_cache[cache_key]
+        keys = [self._cache_key(text) for text in texts]
+        
+        # Look up and gather every hit in one fancy-indexed read under the lock, so no
+        # insert (here or in another request) can reuse a row between lookup and read
+        with self._cache_lock:
+            rows = [self._cache_row(key) for key in keys]
+            hits = [i for i, row in enumerate(rows) if row is not None]
+            missing = [i for i, row in enumerate(rows) if row is None]
+            cached = self._cache_read([rows[i] for i in hits]) if hits else None
+        
+        # Position -> embedding for everything not found in memory
+        found: Dict[int, np.ndarray] = {}
+        
+        if missing and self._disk is not None:
+            stored = self._disk.get_many([keys[i] for i in missing])
+            for i in missing:
+                if keys[i] in stored:
+                    quantized, scale = stored[keys[i]]
+                    self._cache_put(keys[i], quantized, scale)
+                    found[i] = quantized.astype(np.float32) * scale
+        
+        to_encode = [i for i in missing if i not in found]
+        if to_encode:
+            # Encode each unique uncached text once
+            unique = list(dict.fromkeys(texts[i] for i in to_encode))
+            encoded = self.model.encode(
+                unique,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            ).astype(np.float32)
+            by_text = dict(zip(unique, encoded))
+            
+            new_entries = {}
+            for i in to_encode:
+                quantized, scale = self._quantize(by_text[texts[i]])
+                new_entries[keys[i]] = (quantized, scale)
+                self._cache_put(keys[i], quantized, scale)
+                # Return the stored int8 form, so cold and warm calls score identically
+                found[i] = quantized.astype(np.float32) * scale
+            if self._disk is not None:
+                self._disk.put_many(new_entries)
         
-        embedding = self.model.encode(text, convert_to_numpy=True)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
         
-        if cache_key:
-            self.embedding_cache[cache_key] = embedding
+        embeddings = np.empty((len(texts), self._cache_vectors.shape[1]), dtype=np.float32)
+        if hits:
+            embeddings[hits] = cached
+        for i, embedding in found.items():
+            embeddings[i] = embedding
         
-        return embedding
+        return embeddings
     
     def calculate_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
         Calculate cosine similarity between two embeddings
         
         Args:
-            embedding1: First embedding vector
-            embedding2: Second embedding vector
+            embedding1: First L2-normalized embedding vector (from get_embedding)
+            embedding2: Second L2-normalized embedding vector
             
         Returns:
             Similarity score (0-100)
         """
-        # Cosine similarity
-        similarity = np.dot(embedding1, embedding2) / (
-            np.linalg.norm(embedding1) * np.linalg.norm(embedding2)
-        )
+        # Both vectors are unit length, so the dot product is the cosine
+        similarity = np.dot(embedding1, embedding2)
         
         # Convert to percentage (0-100)
         return float(similarity * 100)
@@ -76,39 +289,24 @@ class SemanticMatcher:
         Args:
             resume_text: Full resume text
             job_description: Job description text
-            resume_id: Optional ID for caching
-            job_id: Optional ID for caching
+            resume_id: Optional resume ID (embeddings are cached by content)
+            job_id: Optional job ID (embeddings are cached by content)
             
         Returns:
             Match result with similarity score and breakdown
         """
         # Get embeddings
-        resume_embedding = self.get_embedding(
-            resume_text,
-            cache_key=f"resume_{resume_id}" if resume_id else None
-        )
-        
-        job_embedding = self.get_embedding(
-            job_description,
-            cache_key=f"job_{job_id}" if job_id else None
-        )
+        resume_embedding = self.get_embedding(resume_text)
+        job_embedding = self.get_embedding(job_description)
         
         # Calculate overall similarity
         overall_score = self.calculate_similarity(resume_embedding, job_embedding)
         
         # Determine match level
-        if overall_score >= 80:
-            match_level = "Excellent Match"
-            color = "🟢"
-        elif overall_score >= 65:
-            match_level = "Good Match"
-            color = "🟡"
-        elif overall_score >= 50:
-            match_level = "Fair Match"
-            color = "🟠"
-        else:
-            match_level = "Weak Match"
-            color = "🔴"
+        color, match_level = next(
+            ((color, label) for threshold, color, label in MATCH_LEVELS if overall_score >= threshold),
+            WEAK_MATCH
+        )
         
         return {
             "match_score": round(overall_score, 2),
@@ -121,7 +319,8 @@ class SemanticMatcher:
         self,
         resume_text: str,
         jobs: List[Dict],
-        resume_id: str = None
+        resume_id: str = None,
+        top_k: Optional[int] = None
     ) -> List[Dict]:
         """
         Match a resume to multiple jobs and rank them
@@ -129,51 +328,51 @@ class SemanticMatcher:
         Args:
             resume_text: Full resume text
             jobs: List of job dicts with 'id', 'title', 'company', 'description'
-            resume_id: Optional resume ID for caching
+            resume_id: Optional resume ID (embeddings are cached by content)
+            top_k: Only return the best top_k matches (default: all jobs)
             
         Returns:
             Ranked list of job matches
         """
-        # Get resume embedding once
-        resume_embedding = self.get_embedding(
-            resume_text,
-            cache_key=f"resume_{resume_id}" if resume_id else None
-        )
+        if not jobs:
+            return []
+        
+        # Encode the resume and every job description in one batch
+        embeddings = self.get_embeddings([resume_text] + [job['description'] for job in jobs])
+        resume_embedding, job_embeddings = embeddings[0], embeddings[1:]
+        
+        # Cosine similarity for every job in a single matrix-vector product (vectors are unit length)
+        scores = ((job_embeddings @ resume_embedding) * 100).tolist()
+        rounded = [round(score, 2) for score in scores]
+        
+        # Rank by match score (highest first, ties in input order); with top_k, a heap
+        # selection avoids sorting the whole list, and only the kept jobs get result dicts
+        if top_k is not None and top_k < len(jobs):
+            order = heapq.nlargest(top_k, range(len(jobs)), key=rounded.__getitem__)
+        else:
+            order = sorted(range(len(jobs)), key=rounded.__getitem__, reverse=True)
         
         matches = []
         
-        for job in jobs:
-            job_embedding = self.get_embedding(
-                job['description'],
-                cache_key=f"job_{job.get('id')}" if job.get('id') else None
-            )
-            
-            score = self.calculate_similarity(resume_embedding, job_embedding)
-            
+        for i in order:
+            job = jobs[i]
             matches.append({
                 "job_id": job.get('id'),
                 "job_title": job.get('title', 'Unknown'),
                 "company": job.get('company', 'Unknown'),
-                "match_score": round(score, 2),
-                "match_level": self._get_match_level(score),
+                "match_score": rounded[i],
+                "match_level": self._get_match_level(scores[i]),
                 "job_description": job.get('description', '')[:200] + "..."
             })
         
-        # Sort by match score (highest first)
-        matches.sort(key=lambda x: x['match_score'], reverse=True)
-        
         return matches
     
     def _get_match_level(self, score: float) -> str:
         """Helper to get match level from score"""
-        if score >= 80:
-            return "🟢 Excellent Match"
-        elif score >= 65:
-            return "🟡 Good Match"
-        elif score >= 50:
-            return "🟠 Fair Match"
-        else:
-            return "🔴 Weak Match"
+        for threshold, level in _RANKED_LEVELS:
+            if score >= threshold:
+                return level
+        return _RANKED_WEAK
     
     def _get_recommendation(self, score: float) -> str:
         """Generate recommendation based on match score"""
@@ -0,0 +1,29 @@
+"""
+Shared regex builders for the keyword scanners
+"""
+from typing import Dict, Iterable
+import re
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex matching any of `words` with shared prefixes factored out
+    (e.g. San (?:Antonio|Diego|Jose|Francisco)), so the engine never re-tries
+    alternatives that diverged on an earlier character
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    
+    def build(node: Dict) -> str:
+        if list(node) == ['']:
+            return ''
+        alternatives = [re.escape(ch) + build(child) for ch, child in node.items() if ch != '']
+        pattern = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        # A word ending here (and continuing in a longer one) makes the rest optional
+        return f'(?:{pattern})?' if '' in node else pattern
+    
+    return build(trie)
@@ -3,11 +3,51 @@ Streamlit Frontend for AI Resume & Recruitment System
 """
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import gzip
+import html
+import hashlib
+from collections import OrderedDict
 from datetime import datetime
+from typing import Optional
+
+# orjson is much faster on multi-KB job-description payloads; fall back to stdlib json
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _dumps = lambda obj: json.dumps(obj).encode("utf-8")
+    _loads = json.loads
 
 # API configuration
 API_BASE_URL = "https://web-production-a3dad.up.railway.app/api/v1"
+# (connect, read) seconds; a stalled backend must not hang the Streamlit worker
+DEFAULT_TIMEOUT = (3.05, 30)
+LLM_TIMEOUT = (3.05, 60)  # cover letter generation waits on the LLM
+# JSON bodies at least this big are gzipped (job descriptions compress ~5x)
+GZIP_MIN_BYTES = 1024
+HISTORY_PAGE_SIZE = 10
+# Upload responses remembered per session, so re-submitting identical files doesn't re-post them
+UPLOAD_MEMO_SIZE = 5
+
+# (min score, color, label), highest threshold first
+_ATS_BUCKETS = ((85, "🟢", "Excellent"), (70, "🟡", "Good"), (0, "🔴", "Needs Improvement"))
+# rank -> (icon, color); ranks past 3 fall back to a plain number
+_RANK_MEDALS = {1: ("🥇", "#FFD700"), 2: ("🥈", "#C0C0C0"), 3: ("🥉", "#CD7F32")}
+# insight severity emoji -> box; anything else is shown as info
+_INSIGHT_RENDERERS = {"🚩": st.error, "⚠️": st.warning}
+
+
+def ats_bucket(score: float) -> tuple:
+    """Return (color, label) for an ATS score"""
+    for threshold, color, label in _ATS_BUCKETS:
+        if score >= threshold:
+            return color, label
+    return _ATS_BUCKETS[-1][1:]
 
 # Page config
 st.set_page_config(
@@ -17,6 +57,164 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """HTTP session kept across reruns, so API calls reuse pooled keep-alive connections"""
+    session = requests.Session()
+    # Only idempotent requests (GET/DELETE) are retried; uploads and POSTs never run twice
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        # connect=1: an unreachable backend fails fast instead of after three connect timeouts
+        max_retries=Retry(total=3, connect=1, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+SESSION = get_session()
+
+
+class APIError(Exception):
+    """Non-200 response from the backend, or the backend could not be reached"""
+
+
+def api(method: str, path: str, **kwargs) -> requests.Response:
+    """Send a request to the API through the shared session with a default timeout, gzipping large JSON bodies"""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    if "json" in kwargs:
+        body = _dumps(kwargs.pop("json"))
+        headers = {"Content-Type": "application/json", **kwargs.pop("headers", {})}
+        if len(body) >= GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        kwargs["data"] = body
+        kwargs["headers"] = headers
+    try:
+        return SESSION.request(method, f"{API_BASE_URL}{path}", **kwargs)
+    except (requests.ConnectionError, requests.Timeout) as e:
+        raise APIError(f"API unavailable ({type(e).__name__}), please try again shortly") from e
+
+
+def _get_json(path: str, **params) -> dict:
+    """GET from the API and return the JSON body, raising on HTTP errors"""
+    response = api("GET", path, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+# Every widget change reruns the script, so list views are cached briefly instead of
+# re-fetched on each rerun; uploads and deletes clear them
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_resumes(limit: int = 50) -> dict:
+    """GET /resumes/ (cached for 30 seconds)"""
+    return _get_json("/resumes/", limit=limit)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_resume_page(limit: int, cursor: Optional[str] = None) -> dict:
+    """GET one keyset page of /resumes/ (cached for 30 seconds); only the first page counts the total"""
+    return _get_json("/resumes/", limit=limit, cursor=cursor, include_total=cursor is None)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_resume_full(resume_id: str) -> dict:
+    """GET /resumes/{id} including raw text (cached for 60 seconds)"""
+    return _get_json(f"/resumes/{resume_id}", include="raw_text")['resume']
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_job_analyses(limit: int = 20) -> dict:
+    """GET /jobs/ (cached for 30 seconds)"""
+    return _get_json("/jobs/", limit=limit)
+
+
+def invalidate_resume_lists(deleted: bool = False) -> None:
+    """
+    Drop cached resume lists after an upload or delete, and go back to the first History page
+    
+    Args:
+        deleted: Rows were deleted, so remembered upload responses may name resumes that are gone
+    """
+    fetch_resumes.clear()
+    fetch_resume_page.clear()
+    st.session_state.pop("resume_page_cursors", None)
+    if deleted:
+        st.session_state.pop("resume_upload_memo", None)
+
+
+def upload_digest(files) -> str:
+    """Content digest of (filename, bytes) pairs, used to recognise a repeated upload"""
+    digest = hashlib.blake2b(digest_size=16)
+    for filename, file_bytes in files:
+        digest.update(filename.encode("utf-8") + b"\0")
+        digest.update(hashlib.blake2b(file_bytes, digest_size=16).digest())
+    return digest.hexdigest()
+
+
+def remembered_upload(digest: str) -> Optional[dict]:
+    """This session's earlier response for an identical upload, if any"""
+    memo = st.session_state.get("resume_upload_memo")
+    if not memo or digest not in memo:
+        return None
+    memo.move_to_end(digest)
+    return memo[digest]
+
+
+def remember_upload(digest: str, data: dict) -> None:
+    """Keep an upload response for this session, holding the last UPLOAD_MEMO_SIZE"""
+    memo = st.session_state.setdefault("resume_upload_memo", OrderedDict())
+    memo[digest] = data
+    memo.move_to_end(digest)
+    while len(memo) > UPLOAD_MEMO_SIZE:
+        memo.popitem(last=False)
+
+
+def _post_json(path: str, **kwargs) -> dict:
+    """POST to the API and return the JSON body, raising APIError on failure"""
+    response = api("POST", path, **kwargs)
+    if response.status_code != 200:
+        # Raising (rather than returning) keeps failures out of st.cache_data
+        raise APIError(f"{response.status_code} - {response.text}")
+    return _loads(response.content)
+
+
+# Uploads and job analyses each create a database row, so they aren't st.cache_data'd;
+# a cached upload would hand back a deleted row's ID instead of storing a new one.
+# Repeated uploads go through the session memo above, which deletes clear
+def analyze_resume(file_bytes: bytes, filename: str) -> dict:
+    """POST /resumes/upload"""
+    # Passing the bytes already in hand (not the UploadedFile) saves requests a second read()
+    return _post_json("/resumes/upload", files={'file': (filename, file_bytes, 'application/pdf')})
+
+
+def analyze_resumes_batch(files: tuple) -> dict:
+    """POST /resumes/upload-batch with (filename, bytes) pairs"""
+    return _post_json("/resumes/upload-batch", files=[
+        ('files', (filename, file_bytes, 'application/pdf')) for filename, file_bytes in files
+    ])
+
+
+def analyze_job(job_description: str, posted_date: Optional[str]) -> dict:
+    """POST /jobs/analyze"""
+    return _post_json("/jobs/analyze", json={
+        "job_description": job_description,
+        "posted_date": posted_date
+    })
+
+
+# Matching stores nothing and depends only on its inputs, so identical requests are
+# cached for an hour and keyed by content, not by widget identity
+@st.cache_data(ttl=3600, show_spinner=False)
+def match_cached(resume_text: str, job_description: str) -> dict:
+    """POST /matching/match"""
+    return _post_json("/matching/match", json={
+        "resume_text": resume_text,
+        "job_description": job_description
+    })
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -45,9 +243,129 @@ st.markdown("""
         border-radius: 0.5rem;
         border-left: 4px solid #ffc107;
     }
+    .skill-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 0.5rem;
+        margin-bottom: 1rem;
+    }
+    .skill-grid code {
+        font-weight: bold;
+        text-align: center;
+    }
+    .rank-row {
+        display: flex;
+        align-items: center;
+        gap: 1rem;
+        padding: 0.75rem 0;
+        border-bottom: 1px solid #e6e6e6;
+    }
+    .rank-icon {
+        font-size: 1.75rem;
+        min-width: 2.5rem;
+        text-align: center;
+    }
+    .rank-body {
+        flex: 1;
+    }
+    .rank-level {
+        color: #888;
+        font-size: 0.85rem;
+    }
+    .rank-bar {
+        background-color: #f0f2f6;
+        border-radius: 0.25rem;
+        height: 0.5rem;
+        margin-top: 0.4rem;
+    }
+    .rank-bar div {
+        height: 100%;
+        border-radius: 0.25rem;
+    }
+    .rank-score {
+        font-size: 1.5rem;
+        font-weight: bold;
+        min-width: 4.5rem;
+        text-align: right;
+    }
 </style>
 """, unsafe_allow_html=True)
 
+# Reruns just the decorated block when its own widgets change (Streamlit >= 1.33);
+# older versions fall back to a normal full-script rerun
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+
+@fragment
+def render_resume_history() -> None:
+    """History resume table; ticking checkboxes or paging reruns only this block"""
+    # Only this view needs pandas, so other pages never pay for importing it
+    import pandas as pd
+    
+    st.markdown("### Uploaded Resumes")
+    try:
+        # Pages load on demand; each loaded page's cursor is kept so reruns re-read them from cache
+        cursors = st.session_state.setdefault("resume_page_cursors", [None])
+        pages = [fetch_resume_page(HISTORY_PAGE_SIZE, cursor) for cursor in cursors]
+        # Pages expire separately, so a refreshed earlier page can reach into a later one
+        # after rows are deleted elsewhere; keep each resume once, at its first position
+        resumes = []
+        shown = set()
+        for page in pages:
+            for resume in page.get('resumes', []):
+                if resume['resume_id'] not in shown:
+                    shown.add(resume['resume_id'])
+                    resumes.append(resume)
+        next_cursor = pages[-1].get('next_cursor')
+        
+        if resumes:
+            st.success(f"Showing {len(resumes)} of {pages[0]['total']} resume(s)")
+            
+            # One table element instead of an expander with several widgets per resume;
+            # the checkbox column selects rows for a single batched delete
+            rows = []
+            for resume in resumes:
+                parsed = resume.get('parsed_data', {})
+                rows.append({
+                    "Delete": False,
+                    "File": resume['original_filename'],
+                    "ATS Score": resume['ats_score'],
+                    "Skills": len(parsed.get('skills', [])),
+                    "Email": parsed.get('email') or 'N/A',
+                    "Phone": parsed.get('phone') or 'N/A',
+                    "Uploaded": resume.get('created_at', 'N/A'),
+                    "Resume ID": resume['resume_id']
+                })
+            table = pd.DataFrame(rows)
+            edited = st.data_editor(
+                table,
+                use_container_width=True,
+                hide_index=True,
+                column_config={"Delete": st.column_config.CheckboxColumn("🗑️", default=False)},
+                disabled=[column for column in table.columns if column != "Delete"]
+            )
+            selected_ids = edited.loc[edited["Delete"], "Resume ID"].tolist()
+            
+            if st.button(f"🗑️ Delete selected ({len(selected_ids)})", disabled=not selected_ids):
+                # One request and one transaction for the whole selection, then rerun once
+                # (IDs that were already gone are simply reported back as not_found)
+                _post_json("/resumes/delete-batch", json={"ids": selected_ids})
+                
+                invalidate_resume_lists(deleted=True)
+                fetch_resume_full.clear()
+                st.success("Deleted!")
+                st.rerun()
+            
+            if next_cursor and st.button("⬇️ Load more", use_container_width=True):
+                cursors.append(next_cursor)
+                st.rerun()
+        else:
+            st.info("No resumes uploaded yet. Go to Resume Analysis to upload one!")
+    
+    except Exception as e:
+        st.error(f"Error loading resumes: {str(e)}")
+
+
 # Sidebar navigation
 st.sidebar.title("🗂️ Navigation")
 page = st.sidebar.radio(
@@ -79,108 +397,143 @@ if page == "📄 Resume Analysis":
     st.markdown("---")
     
     # File upload
-    uploaded_file = st.file_uploader(
+    uploaded_files = st.file_uploader(
         "Upload your resume (PDF only)",
         type=['pdf'],
-        help="Upload your resume in PDF format for analysis"
+        accept_multiple_files=True,
+        help="Upload your resume in PDF format for analysis (several versions can be compared at once)"
     )
+    uploaded_file = uploaded_files[0] if len(uploaded_files) == 1 else None
+    
+    if len(uploaded_files) > 1:
+        st.info(f"📎 {len(uploaded_files)} files uploaded")
+        
+        if st.button(f"🚀 Analyze {len(uploaded_files)} Resumes", type="primary", use_container_width=True):
+            with st.spinner("🔄 Analyzing your resumes... This may take a few seconds."):
+                try:
+                    # One request for the whole batch instead of one per file, and none
+                    # if this session already sent the same set of files
+                    files = tuple((f.name, f.getvalue()) for f in uploaded_files)
+                    digest = upload_digest(files)
+                    data = remembered_upload(digest)
+                    if data is None:
+                        data = analyze_resumes_batch(files)
+                        invalidate_resume_lists()
+                        remember_upload(digest, data)
+                    
+                    st.success(f"✅ Analyzed {data['total']} resumes!")
+                    
+                    # One summary table; upload a single file for the full breakdown
+                    rows = ["| File | ATS Score | Skills | Email | Phone |", "|---|---|---|---|---|"]
+                    for result in data['results']:
+                        name = result['original_filename'].replace("|", "\\|")
+                        if result['status'] != "success":
+                            rows.append(f"| {name} | ❌ {result['error']} | | | |")
+                            continue
+                        parsed = result.get('parsed_data', {})
+                        score_color, score_label = ats_bucket(result.get('ats_score', 0))
+                        rows.append(
+                            f"| {name} "
+                            f"| {score_color} {result.get('ats_score', 0)}/100 ({score_label}) "
+                            f"| {len(parsed.get('skills', []))} "
+                            f"| {'✅' if parsed.get('email') else '❌'} "
+                            f"| {'✅' if parsed.get('phone') else '❌'} |"
+                        )
+                    st.markdown("\n".join(rows))
+                
+                except Exception as e:
+                    st.error(f"❌ Error analyzing resumes: {str(e)}")
     
-    if uploaded_file is not None:
+    elif uploaded_file is not None:
         st.info(f"📎 File uploaded: **{uploaded_file.name}** ({uploaded_file.size / 1024:.1f} KB)")
         
         if st.button("🚀 Analyze Resume", type="primary", use_container_width=True):
             with st.spinner("🔄 Analyzing your resume... This may take a few seconds."):
                 try:
-                    # Upload to API
-                    files = {'file': uploaded_file}
-                    response = requests.post(f"{API_BASE_URL}/resumes/upload", files=files)
+                    # Upload to API, unless this session already sent the same file
+                    file_bytes = uploaded_file.getvalue()
+                    digest = upload_digest([(uploaded_file.name, file_bytes)])
+                    data = remembered_upload(digest)
+                    if data is None:
+                        data = analyze_resume(file_bytes, uploaded_file.name)
+                        invalidate_resume_lists()
+                        remember_upload(digest, data)
                     
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        st.success("✅ Resume analyzed successfully!")
-                        
-                        # Display ATS Score
-                        st.markdown("### 📊 ATS Compatibility Score")
-                        ats_score = data.get('ats_score', 0)
-                        
-                        col1, col2, col3 = st.columns([2, 1, 1])
-                        
-                        with col1:
-                            # Score gauge
-                            if ats_score >= 85:
-                                score_color = "🟢"
-                                score_label = "Excellent"
-                            elif ats_score >= 70:
-                                score_color = "🟡"
-                                score_label = "Good"
-                            else:
-                                score_color = "🔴"
-                                score_label = "Needs Improvement"
-                            
-                            st.metric(
-                                label="Your Score",
-                                value=f"{ats_score}/100",
-                                delta=score_label
-                            )
-                            st.progress(ats_score / 100)
-                        
-                        with col2:
-                            st.metric("Skills Found", len(data['parsed_data'].get('skills', [])))
-                        
-                        with col3:
-                            st.metric("Word Count", data['parsed_data'].get('word_count', 0))
-                        
-                        st.markdown("---")
+                    st.success("✅ Resume analyzed successfully!")
+                    
+                    # Display ATS Score
+                    st.markdown("### 📊 ATS Compatibility Score")
+                    ats_score = data.get('ats_score', 0)
+                    parsed = data.get('parsed_data', {})
+                    
+                    col1, col2, col3 = st.columns([2, 1, 1])
+                    
+                    with col1:
+                        # Score gauge
+                        score_color, score_label = ats_bucket(ats_score)
                         
-                        # Display Skills
-                        st.markdown("### 🎯 Extracted Skills")
-                        skills = data['parsed_data'].get('skills', [])
-                        if skills:
-                            # Display as columns of badges
-                            skill_cols = st.columns(4)
-                            for idx, skill in enumerate(skills):
-                                with skill_cols[idx % 4]:
-                                    st.markdown(f"**`{skill}`**")
+                        st.metric(
+                            label="Your Score",
+                            value=f"{ats_score}/100",
+                            delta=score_label
+                        )
+                        st.progress(ats_score / 100)
+                    
+                    with col2:
+                        st.metric("Skills Found", len(parsed.get('skills', [])))
+                    
+                    with col3:
+                        st.metric("Word Count", parsed.get('word_count', 0))
+                    
+                    st.markdown("---")
+                    
+                    # Display Skills
+                    st.markdown("### 🎯 Extracted Skills")
+                    skills = parsed.get('skills', [])
+                    if skills:
+                        # Display as a 4-column grid of badges in a single element
+                        st.markdown(
+                            '<div class="skill-grid">'
+                            + "".join(f"<code>{html.escape(skill)}</code>" for skill in skills)
+                            + "</div>",
+                            unsafe_allow_html=True
+                        )
+                    else:
+                        st.warning("No technical skills detected. Consider adding more specific skills.")
+                    
+                    st.markdown("---")
+                    
+                    # Display Contact Info
+                    st.markdown("### 📧 Contact Information")
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        email = parsed.get('email')
+                        if email:
+                            st.success(f"✅ Email: {email}")
                         else:
-                            st.warning("No technical skills detected. Consider adding more specific skills.")
-                        
-                        st.markdown("---")
-                        
-                        # Display Contact Info
-                        st.markdown("### 📧 Contact Information")
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            email = data['parsed_data'].get('email')
-                            if email:
-                                st.success(f"✅ Email: {email}")
-                            else:
-                                st.error("❌ No email found - add to resume!")
-                        
-                        with col2:
-                            phone = data['parsed_data'].get('phone')
-                            if phone:
-                                st.success(f"✅ Phone: {phone}")
-                            else:
-                                st.error("❌ No phone found - add to resume!")
-                        
-                        st.markdown("---")
-                        
-                        # Display Suggestions
-                        st.markdown("### 💡 Improvement Suggestions")
-                        suggestions = data.get('suggestions', [])
-                        if suggestions:
-                            for suggestion in suggestions:
-                                st.info(suggestion)
+                            st.error("❌ No email found - add to resume!")
+                    
+                    with col2:
+                        phone = parsed.get('phone')
+                        if phone:
+                            st.success(f"✅ Phone: {phone}")
                         else:
-                            st.success("🎉 Your resume looks great! No major issues detected.")
-                        
-                        # Store resume ID
-                        st.session_state['last_resume_id'] = data.get('resume_id')
-                        
+                            st.error("❌ No phone found - add to resume!")
+                    
+                    st.markdown("---")
+                    
+                    # Display Suggestions
+                    st.markdown("### 💡 Improvement Suggestions")
+                    suggestions = data.get('suggestions', [])
+                    if suggestions:
+                        for suggestion in suggestions:
+                            st.info(suggestion)
                     else:
-                        st.error(f"❌ Error: {response.status_code} - {response.text}")
+                        st.success("🎉 Your resume looks great! No major issues detected.")
+                    
+                    # Store resume ID
+                    st.session_state['last_resume_id'] = data.get('resume_id')
                 
                 except Exception as e:
                     st.error(f"❌ Error analyzing resume: {str(e)}")
@@ -197,87 +550,82 @@ elif page == "🔍 Job Analysis":
     
     st.markdown("---")
     
-    # Job description input
-    job_description = st.text_area(
-        "Paste the full job description here:",
-        height=300,
-        placeholder="Copy and paste the complete job posting including title, requirements, company info, etc."
-    )
-    
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        posted_date = st.date_input(
-            "When was this job posted? (optional)",
-            value=None,
-            help="Helps detect stale postings"
+    # Job description input; the form holds edits until Analyze is pressed, so editing
+    # the text or date doesn't rerun the page
+    with st.form("job_analysis_form", clear_on_submit=False):
+        job_description = st.text_area(
+            "Paste the full job description here:",
+            height=300,
+            placeholder="Copy and paste the complete job posting including title, requirements, company info, etc."
         )
+        
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            posted_date = st.date_input(
+                "When was this job posted? (optional)",
+                value=None,
+                help="Helps detect stale postings"
+            )
+        
+        submitted = st.form_submit_button("🔍 Analyze Job Posting", type="primary", use_container_width=True)
     
-    if st.button("🔍 Analyze Job Posting", type="primary", use_container_width=True, disabled=not job_description):
+    if submitted and not job_description:
+        st.warning("⚠️ Paste a job description to analyze.")
+    elif submitted:
         with st.spinner("🔄 Analyzing job posting..."):
             try:
-                payload = {
-                    "job_description": job_description,
-                    "posted_date": posted_date.isoformat() if posted_date else None
-                }
+                data = analyze_job(
+                    job_description,
+                    posted_date.isoformat() if posted_date else None
+                )
+                analysis = data['analysis']
+                fetch_job_analyses.clear()
                 
-                response = requests.post(f"{API_BASE_URL}/jobs/analyze", json=payload)
+                st.success("✅ Job posting analyzed!")
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    analysis = data['analysis']
-                    
-                    st.success("✅ Job posting analyzed!")
-                    
-                    # Hiring Type
-                    st.markdown("### 🎯 Hiring Type Detection")
-                    
-                    hiring_type = analysis['hiring_type']
-                    confidence = analysis['confidence']
-                    
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.metric("Hiring Type", hiring_type)
-                    with col2:
-                        st.metric("Confidence", confidence)
-                    with col3:
-                        active_score = analysis['active_score']
-                        passive_score = analysis['passive_score']
-                        st.metric("Active vs Passive", f"{active_score} vs {passive_score}")
-                    
-                    # Explanation
-                    if "🟢" in hiring_type:
-                        st.markdown(f'<div class="success-box">{analysis["explanation"]}</div>', unsafe_allow_html=True)
-                    else:
-                        st.markdown(f'<div class="warning-box">{analysis["explanation"]}</div>', unsafe_allow_html=True)
-                    
-                    st.markdown("---")
-                    
-                    # Insights
-                    st.markdown("### 🔍 Detailed Insights")
-                    insights = analysis.get('insights', [])
-                    for insight in insights:
-                        if "🚩" in insight:
-                            st.error(insight)
-                        elif "⚠️" in insight:
-                            st.warning(insight)
-                        else:
-                            st.info(insight)
-                    
-                    st.markdown("---")
-                    
-                    # Application Strategy
-                    st.markdown("### 📋 Recommended Application Strategy")
-                    strategy = analysis.get('application_strategy', [])
-                    for tip in strategy:
-                        st.success(tip)
-                    
-                    # Additional Details (expandable)
-                    with st.expander("🔬 Technical Analysis Details"):
-                        st.json(analysis)
+                # Hiring Type
+                st.markdown("### 🎯 Hiring Type Detection")
+                
+                hiring_type = analysis['hiring_type']
+                confidence = analysis['confidence']
+                
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.metric("Hiring Type", hiring_type)
+                with col2:
+                    st.metric("Confidence", confidence)
+                with col3:
+                    active_score = analysis['active_score']
+                    passive_score = analysis['passive_score']
+                    st.metric("Active vs Passive", f"{active_score} vs {passive_score}")
                 
+                # Explanation
+                if "🟢" in hiring_type:
+                    st.markdown(f'<div class="success-box">{analysis["explanation"]}</div>', unsafe_allow_html=True)
                 else:
-                    st.error(f"❌ Error: {response.status_code} - {response.text}")
+                    st.markdown(f'<div class="warning-box">{analysis["explanation"]}</div>', unsafe_allow_html=True)
+                
+                st.markdown("---")
+                
+                # Insights
+                st.markdown("### 🔍 Detailed Insights")
+                insights = analysis.get('insights', [])
+                for insight in insights:
+                    # Insights lead with their severity emoji, so the first token picks the box
+                    _INSIGHT_RENDERERS.get(insight.split(" ", 1)[0], st.info)(insight)
+                
+                st.markdown("---")
+                
+                # Application Strategy
+                st.markdown("### 📋 Recommended Application Strategy")
+                strategy = analysis.get('application_strategy', [])
+                for tip in strategy:
+                    st.success(tip)
+                
+                # Additional Details (expandable)
+                with st.expander("🔬 Technical Analysis Details"):
+                    st.json(analysis)
             
             except Exception as e:
                 st.error(f"❌ Error analyzing job: {str(e)}")
@@ -292,65 +640,70 @@ elif page == "✍️ Generate Cover Letter":
     
     st.markdown("---")
     
-    # Job Details
-    st.markdown("### 📋 Job Information")
+    # One form for all inputs, so the page reruns on submit instead of on every edit
+    with st.form("cover_letter_form", clear_on_submit=False):
+        # Job Details
+        st.markdown("### 📋 Job Information")
+    
+        col1, col2 = st.columns(2)
     
-    col1, col2 = st.columns(2)
+        with col1:
+            job_title = st.text_input(
+                "Job Title",
+                placeholder="e.g., Data Scientist, Software Engineer"
+            )
     
-    with col1:
-        job_title = st.text_input(
-            "Job Title",
-            placeholder="e.g., Data Scientist, Software Engineer"
-        )
+        with col2:
+            company_name = st.text_input(
+                "Company Name",
+                placeholder="e.g., Google, Amazon, Microsoft"
+            )
     
-    with col2:
-        company_name = st.text_input(
-            "Company Name",
-            placeholder="e.g., Google, Amazon, Microsoft"
+        job_description = st.text_area(
+            "Job Description",
+            height=200,
+            placeholder="Paste the job description here..."
         )
     
-    job_description = st.text_area(
-        "Job Description",
-        height=200,
-        placeholder="Paste the job description here..."
-    )
+        st.markdown("---")
     
-    st.markdown("---")
+        # Resume Data (simplified)
+        st.markdown("### 👤 Your Information")
     
-    # Resume Data (simplified)
-    st.markdown("### 👤 Your Information")
+        col1, col2 = st.columns(2)
     
-    col1, col2 = st.columns(2)
+        with col1:
+            candidate_name = st.text_input(
+                "Your Name",
+                placeholder="e.g., John Doe"
+            )
     
-    with col1:
-        candidate_name = st.text_input(
-            "Your Name",
-            placeholder="e.g., John Doe"
-        )
+        with col2:
+            tone = st.selectbox(
+                "Cover Letter Tone",
+                ["professional", "enthusiastic", "formal"],
+                help="Choose the tone that matches your personality and the company culture"
+            )
     
-    with col2:
-        tone = st.selectbox(
-            "Cover Letter Tone",
-            ["professional", "enthusiastic", "formal"],
-            help="Choose the tone that matches your personality and the company culture"
+        skills_input = st.text_input(
+            "Your Top Skills (comma-separated)",
+            placeholder="e.g., Python, SQL, Machine Learning, Data Analysis"
         )
     
-    skills_input = st.text_input(
-        "Your Top Skills (comma-separated)",
-        placeholder="e.g., Python, SQL, Machine Learning, Data Analysis"
-    )
+        experience_input = st.text_area(
+            "Your Recent Experience (brief summary)",
+            height=100,
+            placeholder="e.g., Data Analyst at TechCorp (2020-2024): Led data analysis projects..."
+        )
     
-    experience_input = st.text_area(
-        "Your Recent Experience (brief summary)",
-        height=100,
-        placeholder="e.g., Data Analyst at TechCorp (2020-2024): Led data analysis projects..."
-    )
+        st.markdown("---")
     
-    st.markdown("---")
+        # Generate button
+        submitted = st.form_submit_button("✨ Generate Cover Letter", type="primary", use_container_width=True)
     
-    # Generate button
-    if st.button("✨ Generate Cover Letter", type="primary", use_container_width=True, 
-                 disabled=not (job_title and company_name and job_description and candidate_name)):
+    if submitted and not (job_title and company_name and job_description and candidate_name):
+        st.warning("⚠️ Job title, company, job description and your name are required.")
+    elif submitted:
         
         with st.spinner("🤖 AI is writing your cover letter... This may take 10-15 seconds."):
             try:
@@ -387,61 +740,78 @@ elif page == "✍️ Generate Cover Letter":
                     "tone": tone
                 }
                 
-                response = requests.post(f"{API_BASE_URL}/cover-letters/generate", json=payload)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    cover_letter = data['cover_letter']
-                    word_count = data['word_count']
-                    
-                    st.success("✅ Cover letter generated successfully!")
-                    
-                    # Display metrics
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Word Count", word_count)
-                    with col2:
-                        st.metric("Tone", tone.capitalize())
-                    with col3:
-                        st.metric("Status", "Ready ✅")
-                    
-                    st.markdown("---")
+                # Stream the letter so it appears as it's written instead of after the full generation
+                with api("POST", "/cover-letters/generate-stream", json=payload,
+                         stream=True, timeout=LLM_TIMEOUT) as response:
+                    if response.status_code != 200:
+                        raise APIError(f"{response.status_code} - {response.text}")
                     
-                    # Display cover letter
-                    st.markdown("### 📝 Your Cover Letter")
-                    
-                    # Show in a nice box
-                    st.text_area(
-                        "Cover Letter (click to copy)",
-                        value=cover_letter,
-                        height=400,
-                        label_visibility="collapsed"
-                    )
-                    
-                    # Download button
-                    st.download_button(
-                        label="📥 Download as Text File",
-                        data=cover_letter,
-                        file_name=f"cover_letter_{company_name.replace(' ', '_').lower()}.txt",
-                        mime="text/plain",
-                        use_container_width=True
-                    )
-                    
-                    # Tips
-                    st.info("""
-                    **💡 Next Steps:**
-                    - Review and personalize the letter with specific examples
-                    - Add your contact information at the top
-                    - Include a proper salutation (Dear Hiring Manager, etc.)
-                    - Sign off with your name at the bottom
-                    """)
+                    stream_slot = st.empty()
+                    with stream_slot.container():
+                        st.markdown("### 📝 Your Cover Letter")
+                        cover_letter = st.write_stream(
+                            response.iter_content(chunk_size=None, decode_unicode=True)
+                        )
+                stream_slot.empty()
                 
-                else:
-                    st.error(f"❌ Error: {response.status_code} - {response.text}")
+                # Keep the letter in session_state so interacting with the page afterwards
+                # doesn't lose it (and tempt a regenerate)
+                st.session_state['last_cover_letter'] = {
+                    "text": cover_letter,
+                    "word_count": len(cover_letter.split()),
+                    "tone": tone,
+                    "company": company_name
+                }
+                
+                st.success("✅ Cover letter generated successfully!")
             
             except Exception as e:
-                st.error(f"❌ Error generating cover letter: {str(e)}") 
-   
+                st.error(f"❌ Error generating cover letter: {str(e)}")
+    
+    last_letter = st.session_state.get('last_cover_letter')
+    if last_letter:
+        cover_letter = last_letter['text']
+        
+        # Display metrics
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Word Count", last_letter['word_count'])
+        with col2:
+            st.metric("Tone", last_letter['tone'].capitalize())
+        with col3:
+            st.metric("Status", "Ready ✅")
+        
+        st.markdown("---")
+        
+        # Display cover letter
+        st.markdown("### 📝 Your Cover Letter")
+        
+        # Show in a nice box
+        st.text_area(
+            "Cover Letter (click to copy)",
+            value=cover_letter,
+            height=400,
+            label_visibility="collapsed"
+        )
+        
+        # Download button
+        st.download_button(
+            label="📥 Download as Text File",
+            data=cover_letter,
+            file_name=f"cover_letter_{last_letter['company'].replace(' ', '_').lower()}.txt",
+            mime="text/plain",
+            use_container_width=True
+        )
+        
+        # Tips
+        st.info("""
+        **💡 Next Steps:**
+        - Review and personalize the letter with specific examples
+        - Add your contact information at the top
+        - Include a proper salutation (Dear Hiring Manager, etc.)
+        - Sign off with your name at the bottom
+        """)
+
 elif page == "🎯 Job Matching":
     st.markdown('<p class="main-header">🎯 Semantic Job Matching</p>', unsafe_allow_html=True)
     
@@ -472,32 +842,28 @@ elif page == "🎯 Job Matching":
     else:
         # Fetch available resumes
         try:
-            response = requests.get(f"{API_BASE_URL}/resumes/?limit=50")
-            if response.status_code == 200:
-                data = response.json()
-                resumes = data.get('resumes', [])
+            data = fetch_resumes(limit=50)
+            resumes = data.get('resumes', [])
+            
+            if resumes:
+                resume_options = {
+                    f"{r['original_filename']} (Score: {r['ats_score']})": r['resume_id']
+                    for r in resumes
+                }
                 
-                if resumes:
-                    resume_options = {
-                        f"{r['original_filename']} (Score: {r['ats_score']})": r['resume_id']
-                        for r in resumes
-                    }
-                    
-                    selected = st.selectbox(
-                        "Select a previously uploaded resume:",
-                        options=list(resume_options.keys())
-                    )
-                    
-                    if selected:
-                        resume_id = resume_options[selected]
-                        # Get the full resume
-                        resume_response = requests.get(f"{API_BASE_URL}/resumes/{resume_id}")
-                        if resume_response.status_code == 200:
-                            resume_data = resume_response.json()['resume']
-                            resume_text = resume_data['parsed_data']['raw_text']
-                            st.success(f"✅ Loaded: {selected}")
-                else:
-                    st.warning("No resumes uploaded yet. Upload one in Resume Analysis first!")
+                selected = st.selectbox(
+                    "Select a previously uploaded resume:",
+                    options=list(resume_options.keys())
+                )
+                
+                if selected:
+                    resume_id = resume_options[selected]
+                    # Get the full resume
+                    resume_data = fetch_resume_full(resume_id)
+                    resume_text = resume_data['parsed_data']['raw_text']
+                    st.success(f"✅ Loaded: {selected}")
+            else:
+                st.warning("No resumes uploaded yet. Upload one in Resume Analysis first!")
         except Exception as e:
             st.error(f"Error loading resumes: {str(e)}")
     
@@ -532,65 +898,54 @@ elif page == "🎯 Job Matching":
             
             with st.spinner("🔄 Analyzing semantic similarity..."):
                 try:
-                    payload = {
-                        "resume_text": resume_text,
-                        "job_description": job_description
-                    }
+                    data = match_cached(resume_text, job_description)
+                    match = data['match']
                     
-                    response = requests.post(f"{API_BASE_URL}/matching/match", json=payload)
+                    st.success("✅ Match analysis complete!")
                     
-                    if response.status_code == 200:
-                        data = response.json()
-                        match = data['match']
-                        
-                        st.success("✅ Match analysis complete!")
-                        
-                        # Big score display
-                        col1, col2, col3 = st.columns([2, 2, 2])
-                        
-                        with col1:
-                            st.metric(
-                                "Match Score",
-                                f"{match['match_score']}%",
-                                delta=match['match_level']
-                            )
-                        
-                        with col2:
-                            st.metric(
-                                "Match Level",
-                                match['match_level'],
-                                delta=match['color']
-                            )
-                        
-                        with col3:
-                            if match['match_score'] >= 65:
-                                st.metric("Recommendation", "Apply!", delta="✅")
-                            else:
-                                st.metric("Recommendation", "Consider", delta="⚠️")
-                        
-                        # Progress bar
-                        st.progress(match['match_score'] / 100)
-                        
-                        # Recommendation
-                        st.info(f"**💡 {match['recommendation']}**")
-                        
-                        # Additional context
-                        with st.expander("📊 Understanding Your Score"):
-                            st.markdown("""
-                            **Score Breakdown:**
-                            - **80-100%**: 🟢 Excellent Match - You're a top candidate
-                            - **65-79%**: 🟡 Good Match - Strong fit with some gaps
-                            - **50-64%**: 🟠 Fair Match - Consider skill development
-                            - **0-49%**: 🔴 Weak Match - Focus on better-aligned roles
-                            
-                            **What This Means:**
-                            Semantic matching analyzes the *meaning* of your experience vs job requirements,
-                            not just keyword matches. A high score means your background genuinely aligns
-                            with what the company needs.
-                            """)
+                    # Big score display
+                    col1, col2, col3 = st.columns([2, 2, 2])
                     
-                    else:
-                        st.error(f"Error: {response.status_code} - {response.text}")
+                    with col1:
+                        st.metric(
+                            "Match Score",
+                            f"{match['match_score']}%",
+                            delta=match['match_level']
+                        )
+                    
+                    with col2:
+                        st.metric(
+                            "Match Level",
+                            match['match_level'],
+                            delta=match['color']
+                        )
+                    
+                    with col3:
+                        if match['match_score'] >= 65:
+                            st.metric("Recommendation", "Apply!", delta="✅")
+                        else:
+                            st.metric("Recommendation", "Consider", delta="⚠️")
+                    
+                    # Progress bar
+                    st.progress(match['match_score'] / 100)
+                    
+                    # Recommendation
+                    st.info(f"**💡 {match['recommendation']}**")
+                    
+                    # Additional context
+                    with st.expander("📊 Understanding Your Score"):
+                        st.markdown("""
+                        **Score Breakdown:**
+                        - **80-100%**: 🟢 Excellent Match - You're a top candidate
+                        - **65-79%**: 🟡 Good Match - Strong fit with some gaps
+                        - **50-64%**: 🟠 Fair Match - Consider skill development
+                        - **0-49%**: 🔴 Weak Match - Focus on better-aligned roles
+                        
+                        **What This Means:**
+                        Semantic matching analyzes the *meaning* of your experience vs job requirements,
+                        not just keyword matches. A high score means your background genuinely aligns
+                        with what the company needs.
+                        """)
                 
                 except Exception as e:
                     st.error(f"Error: {str(e)}")
@@ -602,31 +957,36 @@ elif page == "🎯 Job Matching":
         
         jobs = []
         
-        for i in range(num_jobs):
-            with st.expander(f"Job {i+1}", expanded=(i==0)):
-                col1, col2 = st.columns(2)
-                with col1:
-                    title = st.text_input(f"Job Title {i+1}", key=f"title_{i}", placeholder="e.g., Data Scientist")
-                with col2:
-                    comp = st.text_input(f"Company {i+1}", key=f"company_{i}", placeholder="e.g., Google")
+        # A form batches the job fields, so typing doesn't rerun the page on every keystroke
+        with st.form("multi_jobs_form", clear_on_submit=False):
+            for i in range(num_jobs):
+                with st.expander(f"Job {i+1}", expanded=(i==0)):
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        title = st.text_input(f"Job Title {i+1}", key=f"title_{i}", placeholder="e.g., Data Scientist")
+                    with col2:
+                        comp = st.text_input(f"Company {i+1}", key=f"company_{i}", placeholder="e.g., Google")
                 
-                desc = st.text_area(
-                    f"Job Description {i+1}:",
-                    key=f"desc_{i}",
-                    height=150,
-                    placeholder="Paste job description..."
-                )
+                    desc = st.text_area(
+                        f"Job Description {i+1}:",
+                        key=f"desc_{i}",
+                        height=150,
+                        placeholder="Paste job description..."
+                    )
                 
-                if title and comp and desc:
-                    jobs.append({
-                        "id": f"job_{i+1}",
-                        "title": title,
-                        "company": comp,
-                        "description": desc
-                    })
+                    if title and comp and desc:
+                        jobs.append({
+                            "id": f"job_{i+1}",
+                            "title": title,
+                            "company": comp,
+                            "description": desc
+                        })
         
-        if st.button("🏆 Rank Jobs by Match", type="primary", use_container_width=True,
-                     disabled=not (resume_text and len(jobs) >= 2)):
+            submitted = st.form_submit_button("🏆 Rank Jobs by Match", type="primary", use_container_width=True)
+        
+        if submitted and not (resume_text and len(jobs) >= 2):
+            st.warning("⚠️ Provide your resume and at least two complete jobs (title, company and description).")
+        elif submitted:
             
             with st.spinner(f"🔄 Ranking {len(jobs)} jobs by semantic similarity..."):
                 try:
@@ -635,48 +995,36 @@ elif page == "🎯 Job Matching":
                         "jobs": jobs
                     }
                     
-                    response = requests.post(f"{API_BASE_URL}/matching/match-multiple", json=payload)
+                    response = api("POST", "/matching/match-multiple", json=payload)
                     
                     if response.status_code == 200:
-                        data = response.json()
+                        data = _loads(response.content)
                         matches = data['matches']
                         
                         st.success(f"✅ Ranked {data['total_jobs']} jobs!")
                         
                         st.markdown("### 🏆 Your Best Matches (Ranked)")
                         
+                        # One HTML block for the whole ranking instead of ~6 widgets per job
+                        rows = []
                         for i, match in enumerate(matches, 1):
                             score = match['match_score']
                             
                             # Different styling based on rank
-                            if i == 1:
-                                icon = "🥇"
-                                color = "#FFD700"
-                            elif i == 2:
-                                icon = "🥈"
-                                color = "#C0C0C0"
-                            elif i == 3:
-                                icon = "🥉"
-                                color = "#CD7F32"
-                            else:
-                                icon = f"{i}."
-                                color = "#666666"
+                            icon, color = _RANK_MEDALS.get(i, (f"{i}.", "#666666"))
                             
-                            with st.container():
-                                col1, col2, col3 = st.columns([1, 4, 2])
-                                
-                                with col1:
-                                    st.markdown(f"### {icon}")
-                                
-                                with col2:
-                                    st.markdown(f"**{match['job_title']}** at {match['company']}")
-                                    st.caption(match['match_level'])
-                                
-                                with col3:
-                                    st.metric("Match", f"{score}%")
-                                
-                                st.progress(score / 100)
-                                st.markdown("---")
+                            rows.append(
+                                f'<div class="rank-row">'
+                                f'<span class="rank-icon">{icon}</span>'
+                                f'<div class="rank-body">'
+                                f'<b>{html.escape(match["job_title"])}</b> at {html.escape(match["company"])}'
+                                f'<div class="rank-level">{html.escape(match["match_level"])}</div>'
+                                f'<div class="rank-bar"><div style="width:{score}%;background:{color}"></div></div>'
+                                f'</div>'
+                                f'<span class="rank-score">{score}%</span>'
+                                f'</div>'
+                            )
+                        st.markdown("".join(rows), unsafe_allow_html=True)
                     
                     else:
                         st.error(f"Error: {response.status_code}")
@@ -687,67 +1035,36 @@ elif page == "🎯 Job Matching":
 elif page == "📊 View History":
     st.markdown('<p class="main-header">📊 Analysis History</p>', unsafe_allow_html=True)
     
-    tab1, tab2 = st.tabs(["📄 Resumes", "🔍 Job Analyses"])
+    # st.tabs would run (and fetch for) both tabs on every rerun; a radio renders only
+    # the selected view, so each interaction makes at most one list request
+    view = st.radio("View", ["📄 Resumes", "🔍 Job Analyses"], horizontal=True, label_visibility="collapsed")
     
-    with tab1:
-        st.markdown("### Uploaded Resumes")
-        try:
-            response = requests.get(f"{API_BASE_URL}/resumes/?limit=20")
-            if response.status_code == 200:
-                data = response.json()
-                resumes = data.get('resumes', [])
-                
-                if resumes:
-                    st.success(f"Found {data['total']} resume(s)")
-                    
-                    for resume in resumes:
-                        with st.expander(f"📄 {resume['original_filename']} - Score: {resume['ats_score']}/100"):
-                            col1, col2 = st.columns(2)
-                            
-                            with col1:
-                                st.write(f"**Resume ID:** {resume['resume_id']}")
-                                st.write(f"**ATS Score:** {resume['ats_score']}/100")
-                                st.write(f"**Skills:** {len(resume['parsed_data']['skills'])}")
-                            
-                            with col2:
-                                st.write(f"**Email:** {resume['parsed_data'].get('email', 'N/A')}")
-                                st.write(f"**Phone:** {resume['parsed_data'].get('phone', 'N/A')}")
-                                st.write(f"**Uploaded:** {resume.get('created_at', 'N/A')}")
-                            
-                            if st.button(f"🗑️ Delete", key=f"del_resume_{resume['resume_id']}"):
-                                del_response = requests.delete(f"{API_BASE_URL}/resumes/{resume['resume_id']}")
-                                if del_response.status_code == 200:
-                                    st.success("Deleted!")
-                                    st.rerun()
-                else:
-                    st.info("No resumes uploaded yet. Go to Resume Analysis to upload one!")
-        
-        except Exception as e:
-            st.error(f"Error loading resumes: {str(e)}")
+    if view == "📄 Resumes":
+        render_resume_history()
     
-    with tab2:
+    else:
         st.markdown("### Job Analyses")
         try:
-            response = requests.get(f"{API_BASE_URL}/jobs/?limit=20")
-            if response.status_code == 200:
-                data = response.json()
-                analyses = data.get('analyses', [])
+            data = fetch_job_analyses(limit=20)
+            analyses = data.get('analyses', [])
+            
+            if analyses:
+                st.success(f"Found {data['total']} job analysis/analyses")
                 
-                if analyses:
-                    st.success(f"Found {data['total']} job analysis/analyses")
-                    
-                    for analysis in analyses:
-                        with st.expander(f"{analysis['hiring_type']} - {analysis['job_description'][:100]}..."):
-                            st.write(f"**Hiring Type:** {analysis['hiring_type']}")
-                            st.write(f"**Confidence:** {analysis['confidence']}")
-                            st.write(f"**Scores:** Active: {analysis['active_score']}, Passive: {analysis['passive_score']}")
-                            st.write(f"**Analyzed:** {analysis.get('created_at', 'N/A')}")
-                            
-                            st.markdown("**Insights:**")
-                            for insight in analysis.get('insights', []):
-                                st.write(f"- {insight}")
-                else:
-                    st.info("No job analyses yet. Go to Job Analysis to analyze one!")
+                for analysis in analyses:
+                    with st.expander(f"{analysis['hiring_type']} - {analysis['job_description'][:100]}..."):
+                        st.markdown(
+                            f"**Hiring Type:** {analysis['hiring_type']}\n\n"
+                            f"**Confidence:** {analysis['confidence']}\n\n"
+                            f"**Scores:** Active: {analysis['active_score']}, Passive: {analysis['passive_score']}\n\n"
+                            f"**Analyzed:** {analysis.get('created_at', 'N/A')}"
+                        )
+                        
+                        st.markdown("**Insights:**\n" + "".join(
+                            f"\n- {insight}" for insight in analysis.get('insights', [])
+                        ))
+            else:
+                st.info("No job analyses yet. Go to Job Analysis to analyze one!")
         
         except Exception as e:
             st.error(f"Error loading job analyses: {str(e)}")
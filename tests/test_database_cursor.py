@@ -0,0 +1,75 @@
+"""
+Keyset pagination over rows that share a created_at second
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, apply_cursor, encode_cursor, normalize_sqlite_timestamps
+from app.models import Resume
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def _page_all(db, page_size):
+    """Follow next cursors until exhausted, returning ids in page order"""
+    seen = []
+    cursor = None
+    while True:
+        query = db.query(Resume).order_by(Resume.created_at.desc(), Resume.id.desc())
+        page = apply_cursor(query, Resume, cursor).limit(page_size).all()
+        if not page:
+            return seen
+        seen.extend(resume.id for resume in page)
+        cursor = encode_cursor(page[-1])
+
+
+def test_pages_do_not_overlap_within_one_second(engine):
+    db = sessionmaker(bind=engine)()
+    same_second = datetime(2026, 1, 1, 10, 0, 0)
+    for i in range(7):
+        db.add(Resume(original_filename=f"r{i}.pdf", file_path=f"r{i}.pdf", created_at=same_second))
+    db.commit()
+
+    ids = _page_all(db, page_size=3)
+
+    assert len(ids) == 7
+    assert len(set(ids)) == 7
+    db.close()
+
+
+def test_pages_do_not_overlap_for_server_default_timestamps(engine):
+    # Rows inserted outside the ORM get SQLite's second-precision CURRENT_TIMESTAMP
+    with engine.begin() as conn:
+        for i in range(5):
+            conn.execute(
+                text(
+                    "INSERT INTO resumes (id, original_filename, file_path, created_at) "
+                    "VALUES (:id, :name, :name, '2026-01-01 10:00:00')"
+                ),
+                {"id": f"legacy-{i}", "name": f"legacy{i}.pdf"}
+            )
+    normalize_sqlite_timestamps(bind=engine)
+
+    db = sessionmaker(bind=engine)()
+    db.add(Resume(original_filename="new.pdf", file_path="new.pdf"))
+    db.commit()
+
+    ids = _page_all(db, page_size=2)
+
+    assert len(ids) == 6
+    assert len(set(ids)) == 6
+    db.close()